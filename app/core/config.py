@@ -2,7 +2,7 @@
 Configuración central de la aplicación.
 """
 import os
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -23,6 +23,30 @@ class Settings(BaseSettings):
     openai_api_key: str = os.getenv("OPENAI_API_KEY")
     openai_model: str = "gpt-4o"
     api_version: str = "2024-12-01-preview"
+    default_system_prompt: str = (
+        "Eres un asistente útil que responde preguntas sobre el contenido "
+        "de los archivos proporcionados."
+    )
+
+    # Conversation Configuration
+    session_ttl_seconds: int = 30 * 60  # Inactividad máxima de una sesión
+
+    # Evaluation Configuration
+    evaluation_prompt_file: str = "prompt.txt"  # Relativo a la raíz del proyecto
+    evaluation_max_workers: int = 4  # Evaluaciones simultáneas por petición
+
+    # Revision Configuration
+    revision_chunk_size: int = 1500  # Caracteres por chunk al comparar revisiones
+    revision_keyword_overlap: float = 0.3  # Fracción de términos del criterio para que un chunk sea relevante
+
+    # Near-duplicate Configuration
+    near_duplicate_num_perm: int = 128  # Componentes de la firma MinHash
+    near_duplicate_bands: int = 32  # Bandas LSH (divide a near_duplicate_num_perm)
+    near_duplicate_shingle_size: int = 5  # Palabras por shingle
+    near_duplicate_top_k: int = 3  # Documentos similares devueltos al subir
+    near_duplicate_max_bucket_size: int = 64  # Documentos máximos por cubeta LSH
+    near_duplicate_max_candidates: int = 16  # Candidatos puntuados por consulta
+    near_duplicate_threshold: float = 0.9  # Similitud mínima para reutilizar evaluaciones
 
     # CORS Configuration
     allowed_origins: List[str] = ["*"]
@@ -30,6 +54,10 @@ class Settings(BaseSettings):
     allowed_headers: List[str] = ["*"]
     allow_credentials: bool = True
     
+    # Response Configuration
+    gzip_minimum_size: int = 4096  # Bytes a partir de los que se comprime la respuesta
+    gzip_compress_level: int = 1  # Nivel gzip: 1 prioriza throughput (apenas más grande que 9)
+    
     # File Upload Configuration
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     allowed_file_types: List[str] = [
@@ -41,6 +69,15 @@ class Settings(BaseSettings):
         "application/json"
     ]
     
+    # Diagnostics Configuration
+    admin_token: Optional[str] = None  # Habilita /admin y el profiling bajo demanda
+    loop_lag_monitor_enabled: bool = True
+    loop_lag_interval_ms: int = 100  # Intervalo del latido del event loop
+    loop_lag_threshold_ms: int = 200  # Lag a partir del cual se registra un bloqueo
+    profiling_interval_ms: int = 5  # Intervalo de muestreo del profiler
+    profiling_max_seconds: int = 60  # Duración máxima de un perfil por ventana
+    profiling_max_stored: int = 20  # Perfiles por petición conservados en memoria
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
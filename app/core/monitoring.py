@@ -0,0 +1,127 @@
+"""
+Monitor de lag del event loop.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, Optional
+
+from .config import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """
+    Detecta bloqueos del event loop y registra dónde se producen.
+
+    Una tarea del loop actualiza un latido cada ``interval``; un hilo vigilante
+    comprueba el latido y, si el loop lleva más de ``threshold`` sin responder,
+    captura el stack del hilo del loop mientras sigue bloqueado.
+    """
+
+    def __init__(self, interval_ms: Optional[int] = None, threshold_ms: Optional[int] = None):
+        """
+        Inicializar el monitor.
+
+        Args:
+            interval_ms: Intervalo del latido en milisegundos
+            threshold_ms: Lag a partir del cual se registra un bloqueo
+        """
+        self.interval = (interval_ms or settings.loop_lag_interval_ms) / 1000
+        self.threshold = (threshold_ms or settings.loop_lag_threshold_ms) / 1000
+
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._reported_beat: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.max_lag = 0.0
+        self.blocked_count = 0
+
+    async def start(self) -> None:
+        """Arrancar el latido en el loop actual y el hilo vigilante."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Monitor de lag del event loop activo (umbral {self.threshold * 1000:.0f} ms)"
+        )
+
+    async def stop(self) -> None:
+        """Detener el latido y el hilo vigilante."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        """Medir el retraso de cada ``sleep`` respecto a lo esperado."""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+
+            lag = now - expected
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.blocked_count += 1
+                logger.warning(f"Event loop bloqueado durante {lag * 1000:.0f} ms")
+
+    def _watch(self) -> None:
+        """Capturar el stack del loop mientras está bloqueado (una vez por bloqueo)."""
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat
+            if stalled <= self.threshold + self.interval or self._reported_beat == beat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._reported_beat = beat
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop sin responder desde hace {stalled * 1000:.0f} ms. "
+                f"Stack del hilo del loop:\n{stack}"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Obtener estadísticas del monitor.
+
+        Returns:
+            Dict[str, Any]: Estado, umbral, lag máximo y número de bloqueos
+        """
+        return {
+            "running": self._task is not None,
+            "interval_ms": round(self.interval * 1000),
+            "threshold_ms": round(self.threshold * 1000),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "blocked_count": self.blocked_count,
+        }
+
+
+# Instancia global del monitor
+loop_lag_monitor = EventLoopLagMonitor()
@@ -0,0 +1,197 @@
+"""
+Profiling por muestreo bajo demanda (formato de stacks plegados para flamegraphs).
+"""
+import asyncio
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+from fastapi import Request
+
+from .config import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Cabecera que activa el profiling de una petición
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def is_admin_token_valid(token: Optional[str]) -> bool:
+    """
+    Verificar un token de administración.
+
+    Args:
+        token: Token recibido
+
+    Returns:
+        bool: True si coincide con ``admin_token`` (siempre False si no está configurado)
+    """
+    if not settings.admin_token or not token:
+        return False
+    return secrets.compare_digest(token, settings.admin_token)
+
+
+def _fold_stack(frame) -> str:
+    """Convertir un frame en una línea de stack plegado (raíz primero)."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class SamplingProfiler:
+    """Profiler que muestrea periódicamente los stacks de todos los hilos."""
+
+    def __init__(self, interval_ms: Optional[int] = None):
+        """
+        Inicializar el profiler.
+
+        Args:
+            interval_ms: Intervalo de muestreo en milisegundos
+        """
+        self.interval = (interval_ms or settings.profiling_interval_ms) / 1000
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self._started = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Empezar a muestrear en un hilo aparte."""
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """
+        Detener el muestreo.
+
+        Returns:
+            str: Perfil en formato de stacks plegados
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        return self.folded()
+
+    def _run(self) -> None:
+        """Bucle de muestreo."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                thread_name = names.get(thread_id, str(thread_id))
+                self.samples[f"{thread_name};{_fold_stack(frame)}"] += 1
+
+    def folded(self) -> str:
+        """
+        Obtener el perfil en formato de stacks plegados.
+
+        Cada línea es ``hilo;frame;...;frame muestras``, compatible con
+        flamegraph.pl, speedscope o inferno.
+
+        Returns:
+            str: Perfil plegado
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileStore:
+    """Almacén en memoria de los últimos perfiles capturados."""
+
+    def __init__(self, max_profiles: Optional[int] = None):
+        """
+        Inicializar el almacén.
+
+        Args:
+            max_profiles: Número máximo de perfiles conservados
+        """
+        self.max_profiles = max_profiles or settings.profiling_max_stored
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, folded: str) -> str:
+        """
+        Guardar un perfil.
+
+        Args:
+            folded: Perfil en formato de stacks plegados
+
+        Returns:
+            str: ID del perfil
+        """
+        profile_id = uuid.uuid4().hex
+        with self._lock:
+            self._profiles[profile_id] = folded
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[str]:
+        """
+        Obtener un perfil guardado.
+
+        Args:
+            profile_id: ID del perfil
+
+        Returns:
+            Optional[str]: Perfil plegado o None si no existe
+        """
+        return self._profiles.get(profile_id)
+
+    def list_ids(self) -> Dict[str, int]:
+        """
+        Listar los perfiles guardados.
+
+        Returns:
+            Dict[str, int]: ID del perfil -> número de stacks distintos
+        """
+        return {profile_id: folded.count("\n") for profile_id, folded in self._profiles.items()}
+
+
+# Instancia global del almacén de perfiles
+profile_store = ProfileStore()
+
+
+async def profiling_middleware(request: Request, call_next):
+    """
+    Perfilar una petición concreta si lleva la cabecera ``X-Profile``.
+
+    Requiere un ``X-Admin-Token`` válido. El perfil se guarda en memoria y su
+    ID se devuelve en la cabecera ``X-Profile-Id``; se descarga desde
+    ``/admin/profiles/{profile_id}``. Se muestrean todos los hilos, por lo que
+    otras peticiones concurrentes también aparecen en el perfil.
+    """
+    if PROFILE_HEADER.lower() not in request.headers or not is_admin_token_valid(
+        request.headers.get(ADMIN_TOKEN_HEADER)
+    ):
+        return await call_next(request)
+
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        response = await call_next(request)
+    finally:
+        folded = await asyncio.to_thread(profiler.stop)
+
+    profile_id = profile_store.add(folded)
+    logger.info(
+        f"Perfil {profile_id} capturado para {request.method} {request.url.path} "
+        f"({profiler.duration * 1000:.0f} ms, {sum(profiler.samples.values())} muestras)"
+    )
+    response.headers[PROFILE_ID_HEADER] = profile_id
+    return response
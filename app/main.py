@@ -4,9 +4,13 @@ Aplicación FastAPI principal modularizada.
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .core.config import settings
-from .routers import files_router, qa_router, health_router
+from .core.monitoring import loop_lag_monitor
+from .core.profiling import profiling_middleware
+from .routers import files_router, qa_router, sessions_router, health_router, admin_router
 
 # Configurar logging
 logging.basicConfig(
@@ -30,6 +34,7 @@ def create_app() -> FastAPI:
         description=settings.app_description,
         version=settings.app_version,
         debug=settings.debug,
+        default_response_class=ORJSONResponse,
     )
     
     # Configurar CORS
@@ -41,10 +46,28 @@ def create_app() -> FastAPI:
         allow_headers=settings.allowed_headers,
     )
     
+    # Comprimir respuestas grandes (evaluaciones, listados)
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.gzip_minimum_size,
+        compresslevel=settings.gzip_compress_level,
+    )
+    
+    # Profiling bajo demanda (cabecera X-Profile + X-Admin-Token)
+    if settings.admin_token:
+        app.middleware("http")(profiling_middleware)
+    
     # Incluir routers
     app.include_router(health_router)
     app.include_router(files_router)
     app.include_router(qa_router)
+    app.include_router(sessions_router)
+    app.include_router(admin_router)
+    
+    # Monitor de bloqueos del event loop
+    if settings.loop_lag_monitor_enabled:
+        app.add_event_handler("startup", loop_lag_monitor.start)
+        app.add_event_handler("shutdown", loop_lag_monitor.stop)
     
     logger.info(f"Aplicación {settings.app_name} v{settings.app_version} creada exitosamente")
     
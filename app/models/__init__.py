@@ -1,12 +1,36 @@
 """
 Inicialización del módulo models.
 """
-from .schemas import AskRequest, UploadResponse, AskResponse, FileInfo, HealthResponse
+from .schemas import (
+    AskRequest,
+    NearDuplicate,
+    UploadResponse,
+    AskResponse,
+    SessionCreateRequest,
+    SessionResponse,
+    SessionAskRequest,
+    SessionAskResponse,
+    Criterio,
+    EvaluateRequest,
+    CriterionEvaluation,
+    EvaluateResponse,
+    FileInfo,
+    HealthResponse
+)
 
 __all__ = [
     "AskRequest",
+    "NearDuplicate",
     "UploadResponse", 
     "AskResponse",
+    "SessionCreateRequest",
+    "SessionResponse",
+    "SessionAskRequest",
+    "SessionAskResponse",
+    "Criterio",
+    "EvaluateRequest",
+    "CriterionEvaluation",
+    "EvaluateResponse",
     "FileInfo",
     "HealthResponse"
 ]
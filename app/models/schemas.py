@@ -1,8 +1,8 @@
 """
 Modelos Pydantic para las requests y responses de la API.
 """
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, List
+from pydantic import BaseModel, Field, field_validator
 
 
 class AskRequest(BaseModel):
@@ -26,16 +26,37 @@ class AskRequest(BaseModel):
         }
 
 
+class NearDuplicate(BaseModel):
+    """Documento previo muy parecido al subido."""
+    file_id: str = Field(..., description="ID del archivo similar")
+    filename: str = Field(..., description="Nombre del archivo similar")
+    similarity: float = Field(..., description="Similitud de Jaccard estimada (0.0 - 1.0)")
+
+
 class UploadResponse(BaseModel):
     """Response model para subida de archivos."""
     filename: str = Field(..., description="Nombre del archivo subido")
     file_id: str = Field(..., description="ID del archivo en OpenAI")
+    revision: int = Field(1, description="Número de revisión del documento")
+    previous_file_id: Optional[str] = Field(None, description="ID de la revisión anterior, si existe")
+    changed_chunks: Optional[int] = Field(
+        None, description="Chunks modificados respecto a la última revisión evaluada (si se pudo comparar)"
+    )
+    near_duplicates: List[NearDuplicate] = Field(
+        default_factory=list, description="Documentos previos más parecidos"
+    )
     
     class Config:
         json_schema_extra = {
             "example": {
                 "filename": "documento.pdf",
-                "file_id": "file-abc123"
+                "file_id": "file-def456",
+                "revision": 2,
+                "previous_file_id": "file-abc123",
+                "changed_chunks": 1,
+                "near_duplicates": [
+                    {"file_id": "file-xyz789", "filename": "plantilla.pdf", "similarity": 0.94}
+                ]
             }
         }
 
@@ -58,6 +79,118 @@ class AskResponse(BaseModel):
         }
 
 
+class SessionCreateRequest(BaseModel):
+    """Request model para crear una sesión de conversación."""
+    file_id: Optional[str] = Field(None, description="ID del archivo específico (por defecto, el último subido)")
+    extra_file_ids: Optional[List[str]] = Field(None, description="IDs adicionales de archivos")
+    system_prompt: Optional[str] = Field(
+        None,
+        description="Prompt del sistema personalizado (opcional). Si no se proporciona, se usará el prompt por defecto."
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "file_id": "file-abc123",
+                "system_prompt": "Eres un asistente útil que responde de manera concisa."
+            }
+        }
+
+
+class SessionResponse(BaseModel):
+    """Response model con el estado de una sesión de conversación."""
+    session_id: str = Field(..., description="ID de la sesión")
+    file_ids: List[str] = Field(..., description="IDs de archivos asociados a la sesión")
+    system_prompt_used: str = Field(..., description="Prompt del sistema utilizado")
+    turns: int = Field(..., description="Turnos completados")
+    expires_in: int = Field(..., description="Segundos hasta que la sesión expire por inactividad")
+
+
+class SessionAskRequest(BaseModel):
+    """Request model para un turno de conversación."""
+    question: str = Field(..., description="Pregunta del turno", min_length=1)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "question": "¿Y cuál es el plazo de ejecución?"
+            }
+        }
+
+
+class SessionAskResponse(BaseModel):
+    """Response model para un turno de conversación."""
+    session_id: str = Field(..., description="ID de la sesión")
+    answer: str = Field(..., description="Respuesta generada por el modelo")
+    turn: int = Field(..., description="Número de turno")
+    model: str = Field(..., description="Modelo de OpenAI utilizado")
+
+
+class Criterio(BaseModel):
+    """Criterio medioambiental a evaluar sobre un documento."""
+    tipo: str = Field("", description="Tipo del criterio (p. ej. Obligatori/Optatiu)")
+    nombre: str = Field(..., description="Nombre del criterio", min_length=1)
+    descripcion: str = Field(..., description="Descripción del criterio")
+    condicionantes: str = Field("", description="Condiciones de aplicabilidad del criterio")
+
+
+class EvaluateRequest(BaseModel):
+    """Request model para evaluar criterios sobre un archivo."""
+    file_id: Optional[str] = Field(None, description="ID del archivo (por defecto, el último subido)")
+    criterios: Optional[List[Criterio]] = Field(
+        None,
+        description="Criterios a evaluar. Si no se proporcionan, se reutilizan los de la revisión anterior."
+    )
+
+    @field_validator("criterios")
+    @classmethod
+    def check_unique_names(cls, criterios: Optional[List[Criterio]]) -> Optional[List[Criterio]]:
+        """Los veredictos se guardan por nombre: no se admiten nombres repetidos."""
+        if criterios:
+            names = [criterio.nombre for criterio in criterios]
+            duplicated = {name for name in names if names.count(name) > 1}
+            if duplicated:
+                raise ValueError(f"Nombres de criterio duplicados: {', '.join(sorted(duplicated))}")
+        return criterios
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "file_id": "file-abc123",
+                "criterios": [
+                    {
+                        "tipo": "Obligatori",
+                        "nombre": "Envasos reutilitzables",
+                        "descripcion": "Els productes es subministraran en envasos reutilitzables.",
+                        "condicionantes": ""
+                    }
+                ]
+            }
+        }
+
+
+class CriterionEvaluation(BaseModel):
+    """Resultado de evaluar un criterio."""
+    criterio: Criterio = Field(..., description="Criterio evaluado")
+    result: Dict[str, Any] = Field(..., description="Evaluación según el esquema de prompt.txt")
+    reused_from: Optional[str] = Field(
+        None, description="ID del archivo del que se reutiliza el veredicto (None si se evaluó ahora)"
+    )
+    similarity: Optional[float] = Field(
+        None, description="Similitud con el casi duplicado del que se reutiliza el veredicto"
+    )
+
+
+class EvaluateResponse(BaseModel):
+    """Response model para evaluación de criterios."""
+    file_id: str = Field(..., description="ID del archivo evaluado")
+    revision: Optional[int] = Field(None, description="Número de revisión del documento")
+    model: str = Field(..., description="Modelo de OpenAI utilizado")
+    evaluated: int = Field(..., description="Criterios evaluados con el modelo en esta petición")
+    reused: int = Field(..., description="Criterios con veredicto reutilizado")
+    results: List[CriterionEvaluation] = Field(..., description="Resultados por criterio")
+
+
 class FileInfo(BaseModel):
     """Información básica de un archivo."""
     filename: str = Field(..., description="Nombre del archivo")
@@ -3,10 +3,14 @@ Inicialización del módulo routers.
 """
 from .files import router as files_router
 from .qa import router as qa_router
+from .sessions import router as sessions_router
 from .health import router as health_router
+from .admin import router as admin_router
 
 __all__ = [
     "files_router",
     "qa_router", 
-    "health_router"
+    "sessions_router",
+    "health_router",
+    "admin_router"
 ]
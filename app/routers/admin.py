@@ -0,0 +1,140 @@
+"""
+Router para endpoints de diagnóstico (lag del event loop y profiling).
+"""
+import asyncio
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from ..core.config import settings
+from ..core.monitoring import loop_lag_monitor
+from ..core.profiling import SamplingProfiler, is_admin_token_valid, profile_store
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Verificar el token de administración.
+
+    Raises:
+        HTTPException: 404 si no hay ``admin_token`` configurado, 403 si el token no es válido
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not is_admin_token_valid(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token de administración no válido"
+        )
+
+
+# Crear router
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    include_in_schema=False,
+    dependencies=[Depends(require_admin)]
+)
+
+
+def _folded_response(folded: str, filename: str) -> PlainTextResponse:
+    """Devolver un perfil plegado como archivo descargable."""
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get(
+    "/loop-lag",
+    summary="Estadísticas del event loop",
+    description="Lag máximo observado y número de bloqueos del event loop."
+)
+def loop_lag_stats():
+    """
+    Estadísticas del monitor de lag.
+
+    Returns:
+        dict: Estado del monitor, umbral, lag máximo y bloqueos
+    """
+    return loop_lag_monitor.stats()
+
+
+@router.post(
+    "/profile",
+    summary="Perfil por ventana de tiempo",
+    description="Muestrea todos los hilos durante `seconds` y devuelve stacks plegados para flamegraph."
+)
+async def profile_window(seconds: float = Query(10.0, gt=0)):
+    """
+    Capturar un perfil durante una ventana de tiempo.
+
+    Args:
+        seconds: Duración de la ventana
+
+    Returns:
+        PlainTextResponse: Perfil en formato de stacks plegados
+
+    Raises:
+        HTTPException: Si la ventana supera ``profiling_max_seconds``
+    """
+    if seconds > settings.profiling_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Duración máxima: {settings.profiling_max_seconds}s"
+        )
+
+    profiler = SamplingProfiler()
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        folded = await asyncio.to_thread(profiler.stop)
+
+    logger.info(f"Perfil por ventana capturado ({seconds:.1f}s, {sum(profiler.samples.values())} muestras)")
+    return _folded_response(folded, "profile.folded")
+
+
+@router.get(
+    "/profiles",
+    summary="Perfiles por petición disponibles",
+    description="Lista los perfiles capturados con la cabecera X-Profile."
+)
+def list_profiles():
+    """
+    Listar los perfiles por petición guardados.
+
+    Returns:
+        dict: ID del perfil -> número de stacks distintos
+    """
+    return profile_store.list_ids()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="Descarga un perfil por petición",
+    description="Devuelve un perfil capturado con la cabecera X-Profile en formato de stacks plegados."
+)
+def get_profile(profile_id: str):
+    """
+    Descargar un perfil por petición.
+
+    Args:
+        profile_id: ID del perfil (cabecera X-Profile-Id)
+
+    Returns:
+        PlainTextResponse: Perfil en formato de stacks plegados
+
+    Raises:
+        HTTPException: Si el perfil no existe
+    """
+    folded = profile_store.get(profile_id)
+    if folded is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil no encontrado"
+        )
+    return _folded_response(folded, f"{profile_id}.folded")
@@ -1,12 +1,15 @@
 """
 Router para endpoints relacionados con archivos.
 """
+import asyncio
 import logging
 from typing import List
-from fastapi import APIRouter, File, UploadFile, HTTPException, status
+from fastapi import APIRouter, File, UploadFile, HTTPException, Response, status
 
-from ..models.schemas import UploadResponse, FileInfo
-from ..services import openai_service, file_manager
+from ..models.schemas import UploadResponse, FileInfo, NearDuplicate
+from ..services import openai_service, file_manager, revision_tracker, near_duplicate_index
+from ..services.similarity_index import minhash_signature
+from ..services.text_extractor import extract_text
 from ..core.config import settings
 
 # Configurar logging
@@ -66,12 +69,40 @@ async def upload_file(file: UploadFile = File(...)):
             content_type=file.content_type
         )
         
+        # Un archivo con el mismo nombre es una nueva revisión del documento
+        previous_file_id = file_manager.get_file_id(file.filename)
+        text = await asyncio.to_thread(extract_text, file_content, file.content_type)
+        revision = revision_tracker.register(
+            filename=file.filename,
+            file_id=file_id,
+            text=text,
+            previous_file_id=previous_file_id
+        )
+        diff = revision_tracker.get_diff(file_id)
+        
+        # Buscar documentos previos casi idénticos y añadir este al índice
+        near_duplicates = []
+        signature = await asyncio.to_thread(minhash_signature, text) if text else None
+        if signature is not None:
+            near_duplicates = [
+                NearDuplicate(file_id=dup_id, filename=dup_name, similarity=similarity)
+                for dup_id, dup_name, similarity in near_duplicate_index.query(signature)
+            ]
+            near_duplicate_index.add(file_id, file.filename, signature)
+        
         # Agregar a la gestión local
         file_manager.add_file(file.filename, file_id)
         
         logger.info(f"Archivo subido exitosamente: {file.filename} -> {file_id}")
         
-        return UploadResponse(filename=file.filename, file_id=file_id)
+        return UploadResponse(
+            filename=file.filename,
+            file_id=file_id,
+            revision=revision.number,
+            previous_file_id=previous_file_id,
+            changed_chunks=diff.changed_chunks if diff else None,
+            near_duplicates=near_duplicates
+        )
         
     except HTTPException:
         raise
@@ -94,9 +125,9 @@ def get_recent_files():
     Obtener la lista de archivos recientes.
     
     Returns:
-        List[FileInfo]: Lista de archivos subidos recientemente
+        Response: Lista de archivos subidos recientemente (JSON precalculado con el esquema de FileInfo)
     """
-    return file_manager.get_recent_files()
+    return Response(content=file_manager.get_recent_files_json(), media_type="application/json")
 
 
 @router.delete(
@@ -113,4 +144,6 @@ def clear_file_cache():
         Esto solo limpia la cache local, no elimina los archivos de OpenAI Files API.
     """
     file_manager.clear_files()
+    revision_tracker.clear()
+    near_duplicate_index.clear()
     logger.info("Cache de archivos limpiada por solicitud del usuario")
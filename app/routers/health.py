@@ -1,7 +1,8 @@
 """
 Router para endpoints de health check y información general.
 """
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 
 from ..models.schemas import HealthResponse
 from ..core.config import settings
@@ -9,6 +10,18 @@ from ..core.config import settings
 # Crear router
 router = APIRouter(tags=["Health"])
 
+# Respuestas constantes serializadas una sola vez al arrancar
+_ROOT_PAYLOAD = orjson.dumps({"status": "ok", "docs": "/docs"})
+_HEALTH_PAYLOAD = orjson.dumps({"status": "healthy", "docs": "/docs"})
+_INFO_PAYLOAD = orjson.dumps({
+    "name": settings.app_name,
+    "description": settings.app_description,
+    "version": settings.app_version,
+    "openai_model": settings.openai_model,
+    "docs": "/docs",
+    "redoc": "/redoc"
+})
+
 
 @router.get(
     "/",
@@ -22,9 +35,9 @@ def root():
     Health check de la aplicación.
     
     Returns:
-        HealthResponse: Estado de la aplicación y enlace a documentación
+        Response: Estado de la aplicación y enlace a documentación (HealthResponse precalculado)
     """
-    return HealthResponse(status="ok", docs="/docs")
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
 
 
 @router.get(
@@ -38,9 +51,9 @@ def health_check():
     Health check detallado de la aplicación.
     
     Returns:
-        HealthResponse: Estado de la aplicación y enlace a documentación
+        Response: Estado de la aplicación y enlace a documentación (HealthResponse precalculado)
     """
-    return HealthResponse(status="healthy", docs="/docs")
+    return Response(content=_HEALTH_PAYLOAD, media_type="application/json")
 
 
 @router.get(
@@ -53,13 +66,6 @@ def app_info():
     Información básica de la aplicación.
     
     Returns:
-        dict: Información sobre la aplicación
+        Response: Información sobre la aplicación (JSON precalculado)
     """
-    return {
-        "name": settings.app_name,
-        "description": settings.app_description,
-        "version": settings.app_version,
-        "openai_model": settings.openai_model,
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
+    return Response(content=_INFO_PAYLOAD, media_type="application/json")
@@ -5,8 +5,9 @@ import logging
 from typing import List
 from fastapi import APIRouter, HTTPException, status
 
-from ..models.schemas import AskRequest, AskResponse
-from ..services import openai_service, file_manager
+from ..models.schemas import AskRequest, AskResponse, EvaluateRequest, EvaluateResponse
+from ..services import openai_service, file_manager, evaluation_service
+from ..services.evaluation_service import EvaluationParseError
 from ..core.config import settings
 
 # Configurar logging
@@ -71,16 +72,20 @@ def ask_question(request: AskRequest):
         
         logger.info(f"Procesando pregunta con {len(file_ids)} archivo(s)")
         
+        system_prompt = request.system_prompt or settings.default_system_prompt
+        
         # Procesar la pregunta
         answer = openai_service.ask_about_files(
             question=request.question,
-            file_ids=file_ids
+            file_ids=file_ids,
+            system_prompt=system_prompt
         )
         
         return AskResponse(
             answer=answer,
             used_file_ids=file_ids,
-            model=settings.openai_model
+            model=settings.openai_model,
+            system_prompt_used=system_prompt
         )
         
     except HTTPException:
@@ -91,3 +96,69 @@ def ask_question(request: AskRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error interno del servidor procesando la pregunta"
         )
+
+
+@router.post(
+    "/evaluate",
+    response_model=EvaluateResponse,
+    summary="Evalúa criterios sobre un archivo",
+    description=(
+        "Evalúa criterios medioambientales sobre un archivo con la lógica de prompt.txt. "
+        "Si el archivo es una nueva revisión de un documento ya evaluado, solo se reevalúan "
+        "los criterios afectados por los cambios y el resto conserva su veredicto."
+    )
+)
+def evaluate_criteria(request: EvaluateRequest):
+    """
+    Evaluar criterios sobre un archivo.
+    
+    Args:
+        request: Solicitud con el ID del archivo y los criterios
+        
+    Returns:
+        EvaluateResponse: Resultados por criterio e indicadores de reutilización
+        
+    Raises:
+        HTTPException: Si no hay archivo o criterios, o si ocurre un error
+    """
+    try:
+        file_id = request.file_id or file_manager.get_latest_file_id()
+        if not file_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No hay file_id especificado y no hay archivos subidos en esta sesión."
+            )
+        
+        criterios = (
+            [criterio.model_dump() for criterio in request.criterios]
+            if request.criterios is not None else None
+        )
+        
+        try:
+            evaluation = evaluation_service.evaluate_file(file_id, criterios)
+        except EvaluationParseError as e:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=str(e)
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        logger.info(
+            f"Evaluación de {file_id}: {evaluation['evaluated']} evaluado(s), "
+            f"{evaluation['reused']} reutilizado(s)"
+        )
+        
+        return EvaluateResponse(model=settings.openai_model, **evaluation)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error inesperado evaluando criterios: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor evaluando criterios"
+        )
@@ -0,0 +1,234 @@
+"""
+Router para conversaciones encadenadas sobre archivos.
+"""
+import json
+import logging
+from typing import List
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import run_in_threadpool
+
+from ..models.schemas import SessionCreateRequest, SessionResponse, SessionAskRequest, SessionAskResponse
+from ..services import file_manager, session_manager
+from ..services.session_manager import ConversationSession
+from ..core.config import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Crear router
+router = APIRouter(prefix="/qa/sessions", tags=["Conversaciones"])
+
+
+def _session_response(session: ConversationSession) -> SessionResponse:
+    """Construir la respuesta con el estado de una sesión."""
+    return SessionResponse(
+        session_id=session.session_id,
+        file_ids=session.file_ids,
+        system_prompt_used=session.system_prompt,
+        turns=session.turns,
+        expires_in=session.expires_in
+    )
+
+
+def _get_session_or_404(session_id: str) -> ConversationSession:
+    """Obtener una sesión activa o lanzar 404."""
+    session = session_manager.get_session(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sesión no encontrada o expirada"
+        )
+    return session
+
+
+@router.post(
+    "",
+    response_model=SessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Crea una sesión de conversación",
+    description=(
+        "Crea una conversación asociada a uno o más archivos. Los archivos solo se adjuntan "
+        "en el primer turno; los siguientes encadenan con la respuesta anterior."
+    )
+)
+def create_session(request: SessionCreateRequest):
+    """
+    Crear una sesión de conversación.
+
+    Args:
+        request: Archivos y prompt del sistema de la sesión
+
+    Returns:
+        SessionResponse: Estado de la sesión creada
+
+    Raises:
+        HTTPException: Si no hay archivos disponibles
+    """
+    file_ids: List[str] = []
+
+    if request.file_id:
+        file_ids.append(request.file_id)
+
+    if request.extra_file_ids:
+        file_ids.extend(request.extra_file_ids)
+
+    # Si no se especificaron archivos, usar el último subido
+    if not file_ids:
+        latest_file_id = file_manager.get_latest_file_id()
+        if not latest_file_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No hay file_id especificado y no hay archivos subidos en esta sesión."
+            )
+        file_ids = [latest_file_id]
+
+    session = session_manager.create_session(
+        file_ids=file_ids,
+        system_prompt=request.system_prompt or settings.default_system_prompt
+    )
+    return _session_response(session)
+
+
+@router.get(
+    "/{session_id}",
+    response_model=SessionResponse,
+    summary="Consulta una sesión de conversación",
+    description="Obtiene el estado de una sesión activa."
+)
+def get_session(session_id: str):
+    """
+    Obtener el estado de una sesión.
+
+    Args:
+        session_id: ID de la sesión
+
+    Returns:
+        SessionResponse: Estado de la sesión
+
+    Raises:
+        HTTPException: Si la sesión no existe o ha expirado
+    """
+    return _session_response(_get_session_or_404(session_id))
+
+
+@router.post(
+    "/{session_id}/ask",
+    response_model=SessionAskResponse,
+    summary="Pregunta dentro de una conversación",
+    description="Envía un turno de la conversación sin volver a adjuntar los archivos."
+)
+def ask_in_session(session_id: str, request: SessionAskRequest):
+    """
+    Procesar un turno de la conversación.
+
+    Args:
+        session_id: ID de la sesión
+        request: Pregunta del turno
+
+    Returns:
+        SessionAskResponse: Respuesta del modelo
+
+    Raises:
+        HTTPException: Si la sesión no existe o ocurre un error
+    """
+    session = _get_session_or_404(session_id)
+
+    try:
+        answer, turn = session_manager.ask(session, request.question)
+
+        return SessionAskResponse(
+            session_id=session.session_id,
+            answer=answer,
+            turn=turn,
+            model=settings.openai_model
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error inesperado en la sesión {session_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor procesando la pregunta"
+        )
+
+
+@router.delete(
+    "/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Cierra una sesión de conversación",
+    description="Elimina la sesión local (las respuestas almacenadas en OpenAI no se eliminan)."
+)
+def delete_session(session_id: str):
+    """
+    Eliminar una sesión.
+
+    Args:
+        session_id: ID de la sesión
+
+    Raises:
+        HTTPException: Si la sesión no existe
+    """
+    if not session_manager.delete_session(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sesión no encontrada o expirada"
+        )
+
+
+@router.websocket("/{session_id}/ws")
+async def session_websocket(websocket: WebSocket, session_id: str):
+    """
+    Conversación interactiva por WebSocket.
+
+    Cada mensaje recibido debe ser un JSON ``{"question": "..."}``; se responde
+    con ``{"answer": "...", "turn": n}`` o ``{"error": "..."}``. Los mensajes
+    binarios o que no son JSON se responden con un error sin cerrar la conexión.
+
+    Args:
+        websocket: Conexión WebSocket
+        session_id: ID de la sesión
+    """
+    # Rechazar la conexión si la sesión no existe, antes de aceptarla
+    if session_manager.get_session(session_id) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", status.WS_1000_NORMAL_CLOSURE))
+            if frame.get("text") is None:
+                await websocket.send_json({"error": "Solo se admiten mensajes de texto JSON"})
+                continue
+            try:
+                message = json.loads(frame["text"])
+            except ValueError:
+                await websocket.send_json({"error": "El mensaje no es un JSON válido"})
+                continue
+
+            session = session_manager.get_session(session_id)
+            if session is None:
+                await websocket.send_json({"error": "Sesión no encontrada o expirada"})
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
+
+            question = message.get("question") if isinstance(message, dict) else None
+            if not isinstance(question, str) or not question.strip():
+                await websocket.send_json({"error": "Se requiere el campo 'question'"})
+                continue
+
+            try:
+                # La llamada a OpenAI es síncrona: no bloquear el event loop
+                answer, turn = await run_in_threadpool(session_manager.ask, session, question)
+            except HTTPException as e:
+                await websocket.send_json({"error": e.detail})
+                continue
+
+            await websocket.send_json({"answer": answer, "turn": turn})
+
+    except WebSocketDisconnect:
+        logger.info(f"WebSocket desconectado de la sesión {session_id}")
@@ -3,10 +3,22 @@ Inicialización del módulo services.
 """
 from .openai_service import OpenAIService, openai_service
 from .file_manager import FileManagerService, file_manager
+from .session_manager import SessionManagerService, session_manager
+from .revision_tracker import RevisionTracker, revision_tracker
+from .similarity_index import NearDuplicateIndex, near_duplicate_index
+from .evaluation_service import EvaluationService, evaluation_service
 
 __all__ = [
     "OpenAIService",
     "openai_service",
     "FileManagerService", 
-    "file_manager"
+    "file_manager",
+    "SessionManagerService",
+    "session_manager",
+    "RevisionTracker",
+    "revision_tracker",
+    "NearDuplicateIndex",
+    "near_duplicate_index",
+    "EvaluationService",
+    "evaluation_service"
 ]
@@ -0,0 +1,266 @@
+"""
+Servicio para evaluar criterios sobre documentos con la lógica de prompt.txt.
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from .openai_service import OpenAIService, openai_service
+from .revision_tracker import DocumentRevision, RevisionDiff, RevisionTracker, revision_tracker
+from .similarity_index import NearDuplicateIndex, near_duplicate_index
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Raíz del proyecto (para resolver rutas relativas de configuración)
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Campos de un criterio que se envían al modelo
+CRITERIO_FIELDS = ("tipo", "nombre", "descripcion", "condicionantes")
+
+
+class EvaluationParseError(ValueError):
+    """La respuesta del modelo no sigue el esquema JSON esperado."""
+
+
+def parse_evaluation(answer: str) -> Dict[str, Any]:
+    """
+    Convertir la respuesta del modelo en un diccionario JSON.
+
+    Args:
+        answer: Texto devuelto por el modelo
+
+    Returns:
+        Dict[str, Any]: Evaluación parseada
+
+    Raises:
+        EvaluationParseError: Si la respuesta no contiene un objeto JSON válido
+    """
+    text = answer.strip()
+
+    # Tolerar respuestas envueltas en bloques de código markdown
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.lower().startswith("json"):
+            text = text[4:]
+        text = text.strip()
+
+    try:
+        result = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise EvaluationParseError(f"Respuesta del modelo no es JSON válido: {e}") from e
+
+    if not isinstance(result, dict):
+        raise EvaluationParseError("Respuesta del modelo no es un objeto JSON")
+    return result
+
+
+class EvaluationService:
+    """Servicio para evaluar criterios medioambientales sobre documentos."""
+
+    def __init__(
+        self,
+        ai_service: OpenAIService,
+        prompt_file: Optional[str] = None,
+        tracker: Optional[RevisionTracker] = None,
+        index: Optional[NearDuplicateIndex] = None
+    ):
+        """
+        Inicializar el servicio de evaluación.
+
+        Args:
+            ai_service: Servicio de OpenAI a utilizar
+            prompt_file: Ruta del prompt de evaluación (por defecto, el de la configuración)
+            tracker: Registro de revisiones para reutilizar veredictos (opcional)
+            index: Índice de casi duplicados para reutilizar veredictos (opcional)
+        """
+        self.ai_service = ai_service
+        self.tracker = tracker
+        self.index = index
+        self.prompt_file = prompt_file or settings.evaluation_prompt_file
+        self._prompt: Optional[str] = None
+
+    @property
+    def prompt(self) -> str:
+        """
+        Prompt de evaluación, leído una sola vez desde disco.
+
+        Returns:
+            str: Contenido del prompt
+        """
+        if self._prompt is None:
+            path = Path(self.prompt_file)
+            if not path.is_absolute():
+                path = PROJECT_ROOT / path
+            self._prompt = path.read_text(encoding="utf-8")
+            logger.info(f"Prompt de evaluación cargado desde {path}")
+        return self._prompt
+
+    def evaluate(self, file_id: str, criterio: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Evaluar un criterio sobre un archivo ya subido a OpenAI.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+            criterio: Criterio con los campos tipo, nombre, descripcion y condicionantes
+
+        Returns:
+            Dict[str, Any]: Evaluación según el esquema de salida del prompt
+
+        Raises:
+            HTTPException: Si falla la llamada a OpenAI
+            EvaluationParseError: Si la respuesta del modelo no es JSON válido
+        """
+        payload = {field: criterio.get(field, "") for field in CRITERIO_FIELDS}
+        question = json.dumps({"criterio": payload}, ensure_ascii=False)
+
+        answer = self.ai_service.ask_about_files(
+            question=question,
+            file_ids=[file_id],
+            system_prompt=self.prompt
+        )
+        return parse_evaluation(answer)
+
+    def evaluate_file(
+        self,
+        file_id: str,
+        criterios: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluar criterios sobre un archivo reutilizando veredictos previos.
+
+        Si el archivo es una nueva revisión de un documento ya evaluado, solo
+        se reevalúan los criterios cuyas evidencias o chunks relevantes han
+        cambiado; el resto conserva el veredicto de la última revisión evaluada.
+        También se reutilizan veredictos de documentos casi duplicados con
+        similitud igual o superior a ``near_duplicate_threshold``.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+            criterios: Criterios a evaluar (por defecto, los de la última revisión evaluada)
+
+        Returns:
+            Dict[str, Any]: file_id, revision, evaluated, reused y results
+
+        Raises:
+            HTTPException: Si falla la llamada a OpenAI
+            EvaluationParseError: Si la respuesta del modelo no es JSON válido
+            ValueError: Si no se indican criterios y no hay evaluaciones previas
+        """
+        revision = self.tracker.get_revision(file_id) if self.tracker else None
+        previous = None
+        diff = None
+        if revision is not None and revision.base_file_id:
+            previous = self.tracker.get_revision(revision.base_file_id)
+            diff = self.tracker.get_diff(file_id)
+
+        if criterios is None:
+            source = (revision.evaluations if revision is not None else {}) or (
+                previous.evaluations if previous is not None else {}
+            )
+            criterios = [entry["criterio"] for entry in source.values()]
+            if not criterios:
+                raise ValueError("No se indicaron criterios y el documento no tiene evaluaciones previas")
+
+        near_duplicates = self._near_duplicates(file_id)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(criterios)
+        pending: List[int] = []
+        for index, criterio in enumerate(criterios):
+            results[index] = self._find_reusable(criterio, revision, diff, near_duplicates)
+            if results[index] is None:
+                pending.append(index)
+
+        if pending:
+            logger.info(
+                f"Evaluando {len(pending)} de {len(criterios)} criterio(s) sobre {file_id}"
+            )
+            workers = min(settings.evaluation_max_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                evaluations = executor.map(lambda i: self.evaluate(file_id, criterios[i]), pending)
+                for index, result in zip(pending, evaluations):
+                    entry = {"criterio": criterios[index], "result": result, "source_file_id": file_id}
+                    if revision is not None:
+                        revision.evaluations[criterios[index]["nombre"]] = entry
+                    results[index] = {"criterio": criterios[index], "result": result, "reused_from": None}
+
+        if self.index is not None and revision is not None and revision.evaluations:
+            self.index.mark_evaluated(file_id)
+
+        return {
+            "file_id": file_id,
+            "revision": revision.number if revision is not None else None,
+            "evaluated": len(pending),
+            "reused": len(criterios) - len(pending),
+            "results": results,
+        }
+
+    def _near_duplicates(self, file_id: str) -> List[Tuple[DocumentRevision, float]]:
+        """Revisiones ya evaluadas de documentos casi idénticos al archivo."""
+        if self.index is None or self.tracker is None:
+            return []
+        signature = self.index.get_signature(file_id)
+        if signature is None:
+            return []
+
+        duplicates = []
+        for duplicate_id, _, similarity in self.index.query(
+            signature,
+            min_similarity=settings.near_duplicate_threshold,
+            exclude=file_id
+        ):
+            duplicate = self.tracker.get_revision(duplicate_id)
+            if duplicate is not None and duplicate.evaluations:
+                duplicates.append((duplicate, similarity))
+        return duplicates
+
+    def _find_reusable(
+        self,
+        criterio: Dict[str, str],
+        revision: Optional[DocumentRevision],
+        diff: Optional[RevisionDiff],
+        near_duplicates: List[Tuple[DocumentRevision, float]]
+    ) -> Optional[Dict[str, Any]]:
+        """Buscar un veredicto reutilizable en esta revisión, la anterior o un casi duplicado."""
+        if revision is None:
+            return None
+
+        entry = revision.evaluations.get(criterio["nombre"])
+        if entry is None and diff is not None:
+            earlier = diff.previous.evaluations.get(criterio["nombre"])
+            if (
+                earlier is not None
+                and earlier["criterio"] == criterio
+                and not diff.needs_reevaluation(criterio, earlier["result"])
+            ):
+                entry = revision.evaluations[criterio["nombre"]] = earlier
+        if entry is not None and entry["criterio"] == criterio:
+            return {"criterio": criterio, "result": entry["result"], "reused_from": entry["source_file_id"]}
+
+        for duplicate, similarity in near_duplicates:
+            # Las revisiones del mismo documento ya las decide el diff por chunks
+            if duplicate.filename == revision.filename:
+                continue
+            entry = duplicate.evaluations.get(criterio["nombre"])
+            if entry is not None and entry["criterio"] == criterio:
+                return {
+                    "criterio": criterio,
+                    "result": entry["result"],
+                    "reused_from": entry["source_file_id"],
+                    "similarity": similarity,
+                }
+        return None
+
+
+# Instancia global del servicio
+evaluation_service = EvaluationService(
+    openai_service,
+    tracker=revision_tracker,
+    index=near_duplicate_index
+)
+
+# Las revisiones descartadas dejan de ser candidatas a casi duplicado
+revision_tracker.add_discard_listener(near_duplicate_index.remove)
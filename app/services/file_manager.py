@@ -2,7 +2,9 @@
 Servicio para gestión de archivos en memoria.
 """
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 from ..models.schemas import FileInfo
 
@@ -16,6 +18,8 @@ class FileManagerService:
     def __init__(self):
         """Inicializar el gestor de archivos."""
         self._recent_files: Dict[str, str] = {}  # filename -> file_id
+        self._version = 0  # Se incrementa en cada cambio del listado
+        self._recent_files_json: Tuple[int, bytes] = (-1, b"")  # (versión, listado serializado)
     
     def add_file(self, filename: str, file_id: str) -> None:
         """
@@ -25,7 +29,10 @@ class FileManagerService:
             filename: Nombre del archivo
             file_id: ID del archivo en OpenAI
         """
+        # Reinsertar para que una nueva revisión pase a ser la más reciente
+        self._recent_files.pop(filename, None)
         self._recent_files[filename] = file_id
+        self._version += 1
         logger.info(f"Archivo agregado a la cache: {filename} -> {file_id}")
     
     def get_recent_files(self) -> List[FileInfo]:
@@ -40,6 +47,27 @@ class FileManagerService:
             for filename, file_id in self._recent_files.items()
         ]
     
+    def get_recent_files_json(self) -> bytes:
+        """
+        Obtener la lista de archivos recientes serializada en JSON.
+        
+        Se serializa directamente desde los registros internos, sin construir
+        un ``FileInfo`` por archivo, y se cachea hasta el siguiente cambio.
+        
+        Returns:
+            bytes: Lista de archivos en JSON (mismo esquema que ``FileInfo``)
+        """
+        version, payload = self._recent_files_json
+        if version != self._version:
+            # Si el listado cambia mientras se serializa, la próxima llamada lo regenera
+            version = self._version
+            payload = orjson.dumps([
+                {"filename": filename, "file_id": file_id}
+                for filename, file_id in list(self._recent_files.items())
+            ])
+            self._recent_files_json = (version, payload)
+        return payload
+    
     def get_file_id(self, filename: str) -> Optional[str]:
         """
         Obtener el ID de un archivo por su nombre.
@@ -66,6 +94,7 @@ class FileManagerService:
     def clear_files(self) -> None:
         """Limpiar la lista de archivos recientes."""
         self._recent_files.clear()
+        self._version += 1
         logger.info("Cache de archivos limpiada")
     
     def has_files(self) -> bool:
@@ -1,8 +1,9 @@
 """
 Servicio para interactuar con OpenAI API.
 """
+import asyncio
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from openai import OpenAI
 from fastapi import HTTPException
 
@@ -38,7 +39,9 @@ class OpenAIService:
         try:
             logger.info(f"Subiendo archivo: {filename}")
             
-            uploaded = self.client.files.create(
+            # El cliente es síncrono: se ejecuta en un hilo para no bloquear el event loop
+            uploaded = await asyncio.to_thread(
+                self.client.files.create,
                 file=(filename, file_content, content_type or "application/octet-stream"),
                 purpose="assistants"
             )
@@ -53,13 +56,19 @@ class OpenAIService:
                 detail=f"Error subiendo archivo: {str(e)}"
             )
     
-    def ask_about_files(self, question: str, file_ids: List[str]) -> str:
+    def ask_about_files(
+        self,
+        question: str,
+        file_ids: List[str],
+        system_prompt: Optional[str] = None
+    ) -> str:
         """
         Hacer una pregunta sobre archivos usando Responses API.
         
         Args:
             question: Pregunta del usuario
             file_ids: Lista de IDs de archivos
+            system_prompt: Prompt del sistema (opcional)
             
         Returns:
             str: Respuesta del modelo
@@ -75,27 +84,18 @@ class OpenAIService:
             for file_id in file_ids:
                 user_content.append({"type": "input_file", "file_id": file_id})
             
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": user_content})
+            
             # Llamada a Responses API
             response = self.client.responses.create(
                 model=self.model,
-                input=[
-                    {
-                        "role": "user",
-                        "content": user_content
-                    }
-                ]
+                input=messages
             )
             
-            # Extraer el texto de respuesta
-            out_text_parts = []
-            if response.output and hasattr(response.output, "content"):
-                for content in response.output.content:
-                    if content.get("type") == "output_text":
-                        out_text_parts.append(content.get("text", ""))
-            
-            answer = "\n".join(out_text_parts).strip()
-            if not answer:
-                answer = str(response)
+            answer = self._extract_answer(response)
             
             logger.info("Pregunta procesada exitosamente")
             return answer
@@ -106,6 +106,68 @@ class OpenAIService:
                 status_code=500,
                 detail=f"Error en procesamiento: {str(e)}"
             )
+    
+    def ask_in_conversation(
+        self,
+        question: str,
+        file_ids: List[str],
+        system_prompt: Optional[str] = None,
+        previous_response_id: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Hacer una pregunta dentro de una conversación encadenada.
+        
+        El primer turno adjunta los archivos; los siguientes solo envían la
+        pregunta y encadenan con ``previous_response_id``, de modo que el
+        contexto de los documentos no se vuelve a adjuntar.
+        
+        Args:
+            question: Pregunta del usuario
+            file_ids: IDs de archivos (solo se adjuntan en el primer turno)
+            system_prompt: Instrucciones del sistema (se envían en cada turno)
+            previous_response_id: ID de la respuesta del turno anterior
+            
+        Returns:
+            Tuple[str, str]: Respuesta del modelo e ID de la respuesta
+            
+        Raises:
+            HTTPException: Si ocurre un error al procesar la pregunta
+        """
+        try:
+            user_content = [{"type": "input_text", "text": question}]
+            if previous_response_id is None:
+                for file_id in file_ids:
+                    user_content.append({"type": "input_file", "file_id": file_id})
+            
+            request_params = {
+                "model": self.model,
+                "input": [{"role": "user", "content": user_content}]
+            }
+            # Las instrucciones no se heredan de la respuesta anterior
+            if system_prompt:
+                request_params["instructions"] = system_prompt
+            if previous_response_id:
+                request_params["previous_response_id"] = previous_response_id
+            
+            response = self.client.responses.create(**request_params)
+            
+            logger.info(f"Turno de conversación procesado. Respuesta: {response.id}")
+            return self._extract_answer(response), response.id
+            
+        except Exception as e:
+            logger.error(f"Error procesando turno de conversación: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error en procesamiento: {str(e)}"
+            )
+    
+    @staticmethod
+    def _extract_answer(response) -> str:
+        """Extraer el texto de respuesta de Responses API."""
+        answer = (getattr(response, "output_text", None) or "").strip()
+        if not answer:
+            answer = str(response)
+        return answer
 
 
 # Instancia global del servicio
@@ -0,0 +1,357 @@
+"""
+Servicio para seguir revisiones de documentos y calcular diffs por chunks.
+"""
+import difflib
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from ..core.config import settings
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Palabras vacías (castellano/catalán) que no identifican un criterio
+_STOPWORDS = {
+    "para", "como", "esta", "este", "estos", "estas", "sobre", "entre", "desde",
+    "hasta", "cuando", "donde", "sera", "seran", "debe", "deben", "deberan",
+    "cada", "todo", "toda", "todos", "todas", "otro", "otra", "otros", "otras",
+    "mediante", "segun", "sino", "tambien", "aquest", "aquesta", "aquests",
+    "aquestes", "amb", "hauran", "haura", "pels", "dels", "quan", "tots",
+    "totes", "altres", "tambe", "segons", "durant",
+}
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizar texto para comparaciones (minúsculas, sin tildes, espacios simples).
+
+    Args:
+        text: Texto original
+
+    Returns:
+        str: Texto normalizado
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.split())
+
+
+def chunk_text(text: str, chunk_size: Optional[int] = None) -> List[str]:
+    """
+    Dividir un texto en chunks alineados a párrafos.
+
+    Los chunks se cortan por párrafos para que una inserción no desplace
+    todos los chunks posteriores; solo los párrafos más largos que
+    ``chunk_size`` se parten por tamaño.
+
+    Args:
+        text: Texto del documento
+        chunk_size: Tamaño máximo aproximado de cada chunk en caracteres
+
+    Returns:
+        List[str]: Chunks del documento
+    """
+    chunk_size = chunk_size or settings.revision_chunk_size
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+    chunks: List[str] = []
+    current = ""
+    for paragraph in paragraphs:
+        while len(paragraph) > chunk_size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:chunk_size])
+            paragraph = paragraph[chunk_size:]
+        if current and len(current) + len(paragraph) + 2 > chunk_size:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def criterio_keywords(criterio: Dict[str, str]) -> Set[str]:
+    """
+    Obtener los términos significativos de un criterio.
+
+    Args:
+        criterio: Criterio con descripcion y condicionantes
+
+    Returns:
+        Set[str]: Términos normalizados de al menos 4 caracteres
+    """
+    text = normalize_text(f"{criterio.get('descripcion', '')} {criterio.get('condicionantes', '')}")
+    return {
+        word for word in _WORD_RE.findall(text)
+        if len(word) >= 4 and word not in _STOPWORDS and not word.isdigit()
+    }
+
+
+def extract_evidence(result: Dict[str, Any]) -> List[str]:
+    """
+    Obtener las evidencias citadas en una evaluación previa.
+
+    Args:
+        result: Evaluación según el esquema de prompt.txt
+
+    Returns:
+        List[str]: Fragmentos de evidencia no vacíos
+    """
+    presence = result.get("presence") or {}
+    applicability = result.get("applicability") or {}
+    evidence = list(presence.get("evidence_criterio") or [])
+    evidence.extend(applicability.get("evidence_condicionantes") or [])
+    return [item for item in evidence if isinstance(item, str) and item.strip()]
+
+
+class DocumentRevision:
+    """Revisión concreta de un documento y sus evaluaciones."""
+
+    def __init__(
+        self,
+        filename: str,
+        file_id: str,
+        number: int,
+        text: Optional[str],
+        previous_file_id: Optional[str] = None,
+        base_file_id: Optional[str] = None
+    ):
+        """
+        Inicializar la revisión.
+
+        Args:
+            filename: Nombre lógico del documento
+            file_id: ID del archivo en OpenAI
+            number: Número de revisión (1 para la primera subida)
+            text: Texto extraído o None si no se pudo extraer (sin chunks equivale a None)
+            previous_file_id: ID de la revisión anterior, si existe
+            base_file_id: ID de la revisión de la que se heredan veredictos (la última
+                evaluada; la anterior si ninguna lo está)
+        """
+        self.filename = filename
+        self.file_id = file_id
+        self.number = number
+        self.previous_file_id = previous_file_id
+        self.base_file_id = base_file_id
+        # Sin chunks no hay base para comparar: se trata como texto no extraído
+        self.chunks: Optional[List[str]] = (chunk_text(text) if text is not None else None) or None
+        self.normalized_chunks: Optional[List[str]] = (
+            [normalize_text(chunk) for chunk in self.chunks] if self.chunks is not None else None
+        )
+        self.chunk_hashes: Optional[List[str]] = (
+            [hashlib.sha1(chunk.encode("utf-8")).hexdigest() for chunk in self.normalized_chunks]
+            if self.normalized_chunks is not None else None
+        )
+        self.evaluations: Dict[str, Dict[str, Any]] = {}  # nombre -> {criterio, result}
+
+    def find_chunks(self, fragment: str) -> Set[int]:
+        """Índices de los chunks que contienen un fragmento de evidencia."""
+        needle = normalize_text(fragment).strip(" .…\"'«»")
+        if not needle or self.normalized_chunks is None:
+            return set()
+        return {i for i, chunk in enumerate(self.normalized_chunks) if needle in chunk}
+
+    def keyword_chunks(self, keywords: Set[str], indices: Iterable[int]) -> Set[int]:
+        """Chunks (entre ``indices``) con suficientes términos del criterio."""
+        if not keywords or self.normalized_chunks is None:
+            return set()
+        needed = max(1, round(len(keywords) * settings.revision_keyword_overlap))
+        relevant = set()
+        for i in indices:
+            words = set(_WORD_RE.findall(self.normalized_chunks[i]))
+            if len(keywords & words) >= needed:
+                relevant.add(i)
+        return relevant
+
+
+class RevisionDiff:
+    """Diff por chunks entre dos revisiones de un documento."""
+
+    def __init__(self, previous: DocumentRevision, current: DocumentRevision):
+        """
+        Calcular el diff entre revisiones.
+
+        Args:
+            previous: Revisión anterior
+            current: Revisión nueva
+        """
+        self.previous = previous
+        self.current = current
+        self.changed_old: Set[int] = set()  # Chunks eliminados/modificados en la anterior
+        self.changed_new: Set[int] = set()  # Chunks insertados/modificados en la nueva
+
+        matcher = difflib.SequenceMatcher(
+            None, previous.chunk_hashes, current.chunk_hashes, autojunk=False
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            self.changed_old.update(range(i1, i2))
+            self.changed_new.update(range(j1, j2))
+
+    @property
+    def changed_chunks(self) -> int:
+        """Número de chunks de la revisión nueva que han cambiado."""
+        return len(self.changed_new)
+
+    def needs_reevaluation(self, criterio: Dict[str, str], previous_result: Dict[str, Any]) -> bool:
+        """
+        Decidir si un criterio debe evaluarse de nuevo en la revisión nueva.
+
+        Se reevalúa si las evidencias previas o los chunks relevantes para el
+        criterio (por términos) han cambiado, o si alguna evidencia no puede
+        localizarse en la revisión anterior.
+
+        Args:
+            criterio: Criterio evaluado
+            previous_result: Evaluación de la revisión anterior
+
+        Returns:
+            bool: True si hay que reevaluar el criterio
+        """
+        if not self.changed_old and not self.changed_new:
+            return False
+
+        relevant_old: Set[int] = set()
+        for fragment in extract_evidence(previous_result):
+            located = self.previous.find_chunks(fragment)
+            if not located:
+                return True
+            relevant_old |= located
+
+        keywords = criterio_keywords(criterio)
+        relevant_old |= self.previous.keyword_chunks(keywords, self.changed_old)
+        if relevant_old & self.changed_old:
+            return True
+
+        # El texto nuevo podría aportar presencia o aplicabilidad
+        return bool(self.current.keyword_chunks(keywords, self.changed_new))
+
+
+class RevisionTracker:
+    """Registro en memoria de revisiones de documentos (demo)."""
+
+    def __init__(self):
+        """Inicializar el registro de revisiones."""
+        self._revisions: Dict[str, DocumentRevision] = {}  # file_id -> revisión
+        self._diffs: Dict[str, RevisionDiff] = {}  # file_id -> diff con la anterior
+        self._discard_listeners: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    def add_discard_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Registrar una función a la que se avisa al descartar una revisión.
+
+        Args:
+            listener: Función que recibe el file_id de la revisión descartada
+        """
+        self._discard_listeners.append(listener)
+
+    def register(
+        self,
+        filename: str,
+        file_id: str,
+        text: Optional[str],
+        previous_file_id: Optional[str] = None
+    ) -> DocumentRevision:
+        """
+        Registrar una subida, enlazándola con la revisión anterior si existe.
+
+        El diff se calcula contra la última revisión evaluada, de modo que
+        subir varias revisiones sin evaluar las intermedias no pierde los
+        veredictos. Por documento se conservan solo la revisión nueva, la
+        anterior y esa revisión base.
+
+        Args:
+            filename: Nombre lógico del documento
+            file_id: ID del archivo en OpenAI
+            text: Texto extraído del archivo (None si no se pudo extraer)
+            previous_file_id: ID de la revisión anterior con el mismo nombre
+
+        Returns:
+            DocumentRevision: Revisión registrada
+        """
+        discarded: Set[str] = set()
+        with self._lock:
+            previous = self._revisions.get(previous_file_id) if previous_file_id else None
+            base = previous
+            if previous is not None and not previous.evaluations and previous.base_file_id:
+                # La anterior no se llegó a evaluar: heredar de su base si lo está
+                earlier = self._revisions.get(previous.base_file_id)
+                if earlier is not None and earlier.evaluations:
+                    base = earlier
+
+            number = previous.number + 1 if previous else 1
+            revision = DocumentRevision(
+                filename, file_id, number, text,
+                previous_file_id=previous.file_id if previous else None,
+                base_file_id=base.file_id if base else None
+            )
+            self._revisions[file_id] = revision
+
+            if base is not None:
+                if base.chunk_hashes is not None and revision.chunk_hashes is not None:
+                    diff = RevisionDiff(base, revision)
+                    self._diffs[file_id] = diff
+                    logger.info(
+                        f"Revisión {number} de {filename}: {diff.changed_chunks}/"
+                        f"{len(revision.chunks)} chunks modificados respecto a la revisión {base.number}"
+                    )
+
+                # Descartar las revisiones más antiguas que ya no sirven de base
+                discarded = {previous.previous_file_id, previous.base_file_id} - {base.file_id, None}
+                for old_file_id in discarded:
+                    self._revisions.pop(old_file_id, None)
+                    self._diffs.pop(old_file_id, None)
+                if previous.base_file_id in discarded:
+                    self._diffs.pop(previous.file_id, None)
+
+        for old_file_id in discarded:
+            for listener in self._discard_listeners:
+                listener(old_file_id)
+
+        return revision
+
+    def get_revision(self, file_id: str) -> Optional[DocumentRevision]:
+        """
+        Obtener la revisión asociada a un archivo.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+
+        Returns:
+            Optional[DocumentRevision]: Revisión o None si no está registrada
+        """
+        return self._revisions.get(file_id)
+
+    def get_diff(self, file_id: str) -> Optional[RevisionDiff]:
+        """
+        Obtener el diff de un archivo con su revisión anterior.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+
+        Returns:
+            Optional[RevisionDiff]: Diff con la revisión base o None si es la primera
+                revisión o no hay texto
+        """
+        return self._diffs.get(file_id)
+
+    def clear(self) -> None:
+        """Limpiar todas las revisiones."""
+        with self._lock:
+            self._revisions.clear()
+            self._diffs.clear()
+        logger.info("Revisiones de documentos limpiadas")
+
+
+# Instancia global del registro de revisiones
+revision_tracker = RevisionTracker()
@@ -0,0 +1,168 @@
+"""
+Servicio para gestionar sesiones de conversación sobre archivos.
+"""
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from .openai_service import OpenAIService, openai_service
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class ConversationSession:
+    """Conversación encadenada sobre un conjunto de archivos."""
+
+    def __init__(self, file_ids: List[str], system_prompt: str):
+        """
+        Inicializar la sesión.
+
+        Args:
+            file_ids: IDs de archivos asociados a la conversación
+            system_prompt: Prompt del sistema de la conversación
+        """
+        self.session_id = uuid.uuid4().hex
+        self.file_ids = file_ids
+        self.system_prompt = system_prompt
+        self.previous_response_id: Optional[str] = None
+        self.turns = 0
+        self.last_used = time.monotonic()
+        # Los turnos se serializan para no romper la cadena de respuestas
+        self.lock = threading.Lock()
+
+    @property
+    def expires_in(self) -> int:
+        """Segundos restantes antes de expirar por inactividad."""
+        remaining = settings.session_ttl_seconds - (time.monotonic() - self.last_used)
+        return max(0, int(remaining))
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Verificar si la sesión ha superado el tiempo de inactividad."""
+        now = now if now is not None else time.monotonic()
+        return now - self.last_used > settings.session_ttl_seconds
+
+
+class SessionManagerService:
+    """Servicio para gestionar sesiones de conversación en memoria (demo)."""
+
+    def __init__(self, ai_service: OpenAIService):
+        """
+        Inicializar el gestor de sesiones.
+
+        Args:
+            ai_service: Servicio de OpenAI a utilizar
+        """
+        self.ai_service = ai_service
+        self._sessions: Dict[str, ConversationSession] = {}
+        self._lock = threading.Lock()
+
+    def create_session(self, file_ids: List[str], system_prompt: str) -> ConversationSession:
+        """
+        Crear una sesión de conversación.
+
+        Args:
+            file_ids: IDs de archivos asociados a la conversación
+            system_prompt: Prompt del sistema de la conversación
+
+        Returns:
+            ConversationSession: Sesión creada
+        """
+        self.purge_expired()
+        session = ConversationSession(file_ids, system_prompt)
+        with self._lock:
+            self._sessions[session.session_id] = session
+        logger.info(f"Sesión creada: {session.session_id} ({len(file_ids)} archivo(s))")
+        return session
+
+    def get_session(self, session_id: str) -> Optional[ConversationSession]:
+        """
+        Obtener una sesión activa.
+
+        Args:
+            session_id: ID de la sesión
+
+        Returns:
+            Optional[ConversationSession]: Sesión o None si no existe o ha expirado
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session.is_expired():
+            self.delete_session(session_id)
+            logger.info(f"Sesión expirada: {session_id}")
+            return None
+        return session
+
+    def ask(self, session: ConversationSession, question: str) -> Tuple[str, int]:
+        """
+        Procesar un turno de la conversación.
+
+        Args:
+            session: Sesión activa
+            question: Pregunta del usuario
+
+        Returns:
+            Tuple[str, int]: Respuesta del modelo y número de turno, leído bajo el
+                lock para que un turno concurrente no lo altere
+
+        Raises:
+            HTTPException: Si ocurre un error al procesar la pregunta
+        """
+        with session.lock:
+            answer, response_id = self.ai_service.ask_in_conversation(
+                question=question,
+                file_ids=session.file_ids,
+                system_prompt=session.system_prompt,
+                previous_response_id=session.previous_response_id
+            )
+            session.previous_response_id = response_id
+            session.turns += 1
+            session.last_used = time.monotonic()
+            turn = session.turns
+        return answer, turn
+
+    def delete_session(self, session_id: str) -> bool:
+        """
+        Eliminar una sesión.
+
+        Args:
+            session_id: ID de la sesión
+
+        Returns:
+            bool: True si la sesión existía
+        """
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def purge_expired(self) -> int:
+        """
+        Eliminar las sesiones expiradas.
+
+        Returns:
+            int: Número de sesiones eliminadas
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [sid for sid, session in self._sessions.items() if session.is_expired(now)]
+            for session_id in expired:
+                del self._sessions[session_id]
+        if expired:
+            logger.info(f"{len(expired)} sesión(es) expirada(s) eliminada(s)")
+        return len(expired)
+
+    def get_session_count(self) -> int:
+        """
+        Obtener el número de sesiones en memoria.
+
+        Returns:
+            int: Número de sesiones
+        """
+        return len(self._sessions)
+
+
+# Instancia global del gestor de sesiones
+session_manager = SessionManagerService(openai_service)
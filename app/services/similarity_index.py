@@ -0,0 +1,303 @@
+"""
+Índice de documentos casi duplicados basado en MinHash + LSH.
+"""
+import hashlib
+import heapq
+import logging
+import threading
+from array import array
+from collections import Counter
+from operator import eq
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..core.config import settings
+from .revision_tracker import normalize_text
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+_MAX_HASH = (1 << 64) - 1
+
+
+def _shingle_hashes(text: str, shingle_size: int) -> List[int]:
+    """Hashes de 64 bits de los n-gramas de palabras del texto normalizado."""
+    words = normalize_text(text).split()
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [
+            " ".join(words[i:i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        ]
+    return [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in set(shingles)
+    ]
+
+
+def minhash_signature(
+    text: str,
+    num_perm: Optional[int] = None,
+    shingle_size: Optional[int] = None
+) -> Optional[array]:
+    """
+    Calcular la firma MinHash de un texto.
+
+    Usa one-permutation hashing (un único hash por shingle repartido en
+    ``num_perm`` cubetas) con densificación por rotación para las cubetas
+    vacías, de modo que el coste es lineal en el número de shingles.
+
+    Args:
+        text: Texto del documento
+        num_perm: Número de componentes de la firma
+        shingle_size: Palabras por shingle
+
+    Returns:
+        Optional[array]: Firma MinHash (enteros sin signo de 64 bits) o None si el
+            texto no tiene palabras (p. ej. un PDF escaneado)
+    """
+    num_perm = num_perm or settings.near_duplicate_num_perm
+    shingle_size = shingle_size or settings.near_duplicate_shingle_size
+
+    hashes = _shingle_hashes(text, shingle_size)
+    if not hashes:
+        # Una firma vacía coincidiría al 100% con cualquier otro documento sin texto
+        return None
+
+    bins = [_MAX_HASH] * num_perm
+    for value in hashes:
+        index = value % num_perm
+        rest = value // num_perm
+        if rest < bins[index]:
+            bins[index] = rest
+
+    # Densificación: las cubetas vacías toman el valor de la siguiente no vacía
+    original = list(bins)
+    stride = _MAX_HASH // num_perm
+    for index in range(num_perm):
+        if original[index] != _MAX_HASH:
+            continue
+        offset = 1
+        while original[(index + offset) % num_perm] == _MAX_HASH:
+            offset += 1
+        # El desplazamiento distingue valores prestados de valores propios
+        bins[index] = original[(index + offset) % num_perm] + offset * stride
+
+    return array("Q", bins)
+
+
+def signature_similarity(first: array, second: array) -> float:
+    """
+    Estimar la similitud de Jaccard entre dos firmas.
+
+    Args:
+        first: Firma MinHash
+        second: Firma MinHash
+
+    Returns:
+        float: Fracción de componentes coincidentes (0.0 - 1.0)
+    """
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(map(eq, first, second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """Índice LSH en memoria para encontrar documentos casi duplicados."""
+
+    def __init__(
+        self,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        max_bucket_size: Optional[int] = None,
+        max_candidates: Optional[int] = None
+    ):
+        """
+        Inicializar el índice.
+
+        Args:
+            num_perm: Número de componentes de cada firma
+            bands: Número de bandas LSH (debe dividir a ``num_perm``)
+            max_bucket_size: Documentos máximos por cubeta LSH
+            max_candidates: Candidatos máximos puntuados por consulta
+        """
+        self.num_perm = num_perm or settings.near_duplicate_num_perm
+        self.bands = bands or settings.near_duplicate_bands
+        self.max_bucket_size = max_bucket_size or settings.near_duplicate_max_bucket_size
+        self.max_candidates = max_candidates or settings.near_duplicate_max_candidates
+        if self.num_perm % self.bands:
+            raise ValueError("near_duplicate_num_perm debe ser múltiplo de near_duplicate_bands")
+        self.rows = self.num_perm // self.bands
+
+        self._signatures: Dict[str, array] = {}  # file_id -> firma
+        self._filenames: Dict[str, str] = {}  # file_id -> filename
+        self._evaluated: Set[str] = set()  # file_ids con veredictos reutilizables
+        self._buckets: List[Dict[int, List[str]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature: array) -> List[int]:
+        """Claves de cubeta de cada banda de la firma."""
+        rows = self.rows
+        return [
+            hash(tuple(signature[band * rows:(band + 1) * rows]))
+            for band in range(self.bands)
+        ]
+
+    def _insert(self, file_id: str) -> None:
+        """
+        Añadir un documento a las cubetas de sus bandas (con el lock tomado).
+
+        Cada cubeta admite como máximo ``max_bucket_size`` documentos para
+        acotar el coste de las consultas cuando hay muchas copias de una misma
+        plantilla. Al llenarse se descarta el documento sin evaluar más
+        antiguo; si todos están evaluados, solo entra un documento evaluado.
+        """
+        evaluated = file_id in self._evaluated
+        for buckets, key in zip(self._buckets, self._band_keys(self._signatures[file_id])):
+            bucket = buckets.setdefault(key, [])
+            if file_id in bucket:
+                continue
+            if len(bucket) >= self.max_bucket_size:
+                victim = next((other for other in bucket if other not in self._evaluated), None)
+                if victim is None:
+                    if not evaluated:
+                        continue
+                    victim = bucket[0]
+                bucket.remove(victim)
+            bucket.append(file_id)
+
+    def add(self, file_id: str, filename: str, signature: array) -> None:
+        """
+        Indexar la firma de un documento.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+            filename: Nombre del archivo
+            signature: Firma MinHash del texto extraído
+        """
+        with self._lock:
+            if file_id in self._signatures:
+                return
+            self._signatures[file_id] = signature
+            self._filenames[file_id] = filename
+            self._insert(file_id)
+
+    def mark_evaluated(self, file_id: str) -> None:
+        """
+        Marcar un documento como evaluado.
+
+        Los documentos evaluados tienen preferencia en las cubetas llenas, de
+        modo que sus veredictos siguen siendo reutilizables aunque lleguen
+        después de muchas copias sin evaluar.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+        """
+        with self._lock:
+            if file_id not in self._signatures or file_id in self._evaluated:
+                return
+            self._evaluated.add(file_id)
+            self._insert(file_id)
+
+    def remove(self, file_id: str) -> None:
+        """
+        Quitar un documento del índice.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+        """
+        with self._lock:
+            signature = self._signatures.pop(file_id, None)
+            if signature is None:
+                return
+            self._filenames.pop(file_id, None)
+            self._evaluated.discard(file_id)
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                bucket = buckets.get(key)
+                if bucket is not None and file_id in bucket:
+                    bucket.remove(file_id)
+                    if not bucket:
+                        del buckets[key]
+
+    def get_signature(self, file_id: str) -> Optional[array]:
+        """
+        Obtener la firma indexada de un archivo.
+
+        Args:
+            file_id: ID del archivo en OpenAI
+
+        Returns:
+            Optional[array]: Firma o None si el archivo no está indexado
+        """
+        return self._signatures.get(file_id)
+
+    def query(
+        self,
+        signature: array,
+        top_k: Optional[int] = None,
+        min_similarity: float = 0.0,
+        exclude: Optional[str] = None
+    ) -> List[Tuple[str, str, float]]:
+        """
+        Buscar los documentos más parecidos a una firma.
+
+        Los candidatos se ordenan por número de bandas LSH compartidas (a
+        igualdad, primero los evaluados) y solo se puntúan los
+        ``max_candidates`` primeros; junto con el tope de
+        tamaño de las cubetas, el coste no depende del tamaño del índice ni
+        de cuántas copias haya de una misma plantilla.
+
+        Args:
+            signature: Firma MinHash a buscar
+            top_k: Número máximo de resultados
+            min_similarity: Similitud mínima para incluir un resultado
+            exclude: file_id a excluir (normalmente el propio documento)
+
+        Returns:
+            List[Tuple[str, str, float]]: (file_id, filename, similitud), de mayor a menor
+        """
+        top_k = top_k or settings.near_duplicate_top_k
+
+        band_hits: Counter = Counter()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            band_hits.update(buckets.get(key, ()))
+        band_hits.pop(exclude, None)
+
+        # A igualdad de bandas, primero los documentos evaluados
+        evaluated = self._evaluated
+        candidates = heapq.nlargest(
+            self.max_candidates,
+            band_hits,
+            key=lambda file_id: (band_hits[file_id], file_id in evaluated)
+        )
+
+        scored = []
+        for file_id in candidates:
+            candidate = self._signatures.get(file_id)
+            if candidate is None:
+                # Eliminado mientras se consultaba
+                continue
+            similarity = signature_similarity(signature, candidate)
+            if similarity >= min_similarity:
+                scored.append((file_id, self._filenames.get(file_id, ""), similarity))
+
+        scored.sort(key=lambda item: item[2], reverse=True)
+        return scored[:top_k]
+
+    def clear(self) -> None:
+        """Vaciar el índice."""
+        with self._lock:
+            self._signatures.clear()
+            self._filenames.clear()
+            self._evaluated.clear()
+            for buckets in self._buckets:
+                buckets.clear()
+        logger.info("Índice de casi duplicados limpiado")
+
+    def __len__(self) -> int:
+        """Número de documentos indexados."""
+        return len(self._signatures)
+
+
+# Instancia global del índice
+near_duplicate_index = NearDuplicateIndex()
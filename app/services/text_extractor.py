@@ -0,0 +1,73 @@
+"""
+Extracción de texto plano de los archivos subidos.
+"""
+import io
+import logging
+import zipfile
+from typing import Optional
+from xml.etree import ElementTree
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Namespace de WordprocessingML (documentos .docx)
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Tipos que se decodifican directamente como texto
+_TEXT_TYPES = {"text/plain", "text/csv", "application/json"}
+
+
+def _extract_pdf(file_content: bytes) -> Optional[str]:
+    """Extraer texto de un PDF con pypdf (dependencia opcional)."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning("pypdf no está instalado: no se puede extraer texto de PDF")
+        return None
+
+    reader = PdfReader(io.BytesIO(file_content))
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _extract_docx(file_content: bytes) -> str:
+    """Extraer el texto de los párrafos de un .docx."""
+    with zipfile.ZipFile(io.BytesIO(file_content)) as docx:
+        root = ElementTree.fromstring(docx.read("word/document.xml"))
+
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NS}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{_WORD_NS}t")))
+    return "\n\n".join(paragraphs)
+
+
+def extract_text(file_content: bytes, content_type: Optional[str]) -> Optional[str]:
+    """
+    Extraer el texto de un archivo según su tipo MIME.
+
+    Args:
+        file_content: Contenido del archivo en bytes
+        content_type: Tipo de contenido MIME
+
+    Returns:
+        Optional[str]: Texto extraído o None si el tipo no está soportado, falla la extracción
+            o el texto está vacío
+    """
+    try:
+        if content_type in _TEXT_TYPES:
+            text = file_content.decode("utf-8", errors="replace")
+        elif content_type == "application/pdf":
+            text = _extract_pdf(file_content)
+        elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+            text = _extract_docx(file_content)
+        else:
+            logger.info(f"Extracción de texto no soportada para {content_type}")
+            return None
+    except Exception as e:
+        logger.warning(f"No se pudo extraer texto ({content_type}): {str(e)}")
+        return None
+
+    # Un PDF escaneado produce solo espacios: equivale a no tener texto
+    if text is None or not text.strip():
+        logger.info(f"No se extrajo texto del archivo ({content_type})")
+        return None
+    return text
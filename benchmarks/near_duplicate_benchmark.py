@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de consultas al índice de casi duplicados.
+
+Llena el índice con documentos distintos más un grupo de copias casi idénticas
+de una misma plantilla (el caso en que todas comparten cubetas LSH) y mide la
+latencia de ``NearDuplicateIndex.query`` para consultas de ambos tipos. Se
+compara el índice actual (cubetas acotadas y solo los candidatos con más
+bandas compartidas puntuados) con un índice sin límites que reproduce el
+comportamiento anterior.
+
+Uso:
+    python benchmarks/near_duplicate_benchmark.py --distinct 10000 --cluster 2000
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import List
+
+# Permitir ejecutar el script desde cualquier directorio sin credenciales reales
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from app.core.config import settings
+from app.services.similarity_index import NearDuplicateIndex
+
+_MAX_HASH = (1 << 64) - 1
+
+
+def random_signature(rng: random.Random, num_perm: int) -> array:
+    """Firma de un documento sin relación con los demás."""
+    return array("Q", (rng.getrandbits(64) for _ in range(num_perm)))
+
+
+def perturbed_signature(rng: random.Random, base: array, changes: int) -> array:
+    """Copia de ``base`` con ``changes`` componentes distintos (casi duplicado)."""
+    signature = array("Q", base)
+    for index in rng.sample(range(len(base)), changes):
+        signature[index] = rng.getrandbits(64)
+    return signature
+
+
+def build_index(index: NearDuplicateIndex, distinct: List[array], cluster: List[array]) -> None:
+    """Indexar los documentos distintos y las copias de la plantilla."""
+    for i, signature in enumerate(distinct):
+        index.add(f"distinct-{i}", f"distinct_{i}.pdf", signature)
+    for i, signature in enumerate(cluster):
+        index.add(f"cluster-{i}", f"plantilla_{i}.pdf", signature)
+
+
+def measure(index: NearDuplicateIndex, queries: List[array]) -> List[float]:
+    """Latencia de cada consulta en milisegundos."""
+    latencies = []
+    for signature in queries:
+        started = time.perf_counter()
+        index.query(signature, min_similarity=settings.near_duplicate_threshold)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def describe(latencies: List[float]) -> str:
+    """Mediana y p99 de una serie de latencias."""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"{statistics.median(ordered):>10.3f}{p99:>10.3f}"
+
+
+def main() -> int:
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark del índice de casi duplicados.")
+    parser.add_argument("--distinct", type=int, default=10000, help="Documentos distintos")
+    parser.add_argument("--cluster", type=int, default=2000, help="Copias casi idénticas de una plantilla")
+    parser.add_argument("--changes", type=int, default=4, help="Componentes que difieren entre copias")
+    parser.add_argument("--queries", type=int, default=200, help="Consultas de cada tipo")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla aleatoria")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(args.seed)
+    num_perm = settings.near_duplicate_num_perm
+
+    base = random_signature(rng, num_perm)
+    distinct = [random_signature(rng, num_perm) for _ in range(args.distinct)]
+    cluster = [perturbed_signature(rng, base, args.changes) for _ in range(args.cluster)]
+    cluster_queries = [perturbed_signature(rng, base, args.changes) for _ in range(args.queries)]
+    distinct_queries = [random_signature(rng, num_perm) for _ in range(args.queries)]
+
+    unbounded = NearDuplicateIndex(max_bucket_size=_MAX_HASH, max_candidates=_MAX_HASH)
+    bounded = NearDuplicateIndex()
+    build_index(unbounded, distinct, cluster)
+    build_index(bounded, distinct, cluster)
+
+    print(
+        f"📊 {args.distinct} documentos distintos + {args.cluster} copias de una plantilla "
+        f"({args.changes}/{num_perm} componentes distintos), {args.queries} consultas de cada tipo\n"
+    )
+    print(f"{'Índice':<14}{'Consulta':<12}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for name, index in (("sin límites", unbounded), ("actual", bounded)):
+        print(f"{name:<14}{'plantilla':<12}{describe(measure(index, cluster_queries))}")
+        print(f"{name:<14}{'distinta':<12}{describe(measure(index, distinct_queries))}")
+
+    found = bounded.query(cluster_queries[0], min_similarity=settings.near_duplicate_threshold)
+    print(f"\n🔎 Casi duplicados encontrados por el índice actual: {len(found)} (top_k={settings.near_duplicate_top_k})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
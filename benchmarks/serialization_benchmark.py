@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de serialización de respuestas.
+
+Compara, en proceso y sin red, la aplicación actual (ORJSONResponse, listado
+precalculado de /files/recent, payloads constantes de /health e /info y GZip)
+con una aplicación de referencia que reproduce el camino anterior: encoder
+JSON por defecto, un ``FileInfo`` por fila y diccionarios reconstruidos en
+cada petición.
+
+Uso:
+    python benchmarks/serialization_benchmark.py --files 1000 --requests 2000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Permitir ejecutar el script desde cualquier directorio sin credenciales reales
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.main import create_app
+from app.models.schemas import FileInfo, HealthResponse
+from app.services import file_manager
+
+
+def create_baseline_app() -> FastAPI:
+    """Aplicación con el camino de serialización anterior."""
+    app = FastAPI()
+
+    @app.get("/files/recent", response_model=List[FileInfo])
+    def get_recent_files():
+        return file_manager.get_recent_files()
+
+    @app.get("/health", response_model=HealthResponse)
+    def health_check():
+        return HealthResponse(status="healthy", docs="/docs")
+
+    @app.get("/info")
+    def app_info():
+        return {
+            "name": settings.app_name,
+            "description": settings.app_description,
+            "version": settings.app_version,
+            "openai_model": settings.openai_model,
+            "docs": "/docs",
+            "redoc": "/redoc"
+        }
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, headers: dict) -> float:
+    """Medir peticiones por segundo contra una app ASGI en proceso."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Calentamiento
+        for _ in range(min(50, requests)):
+            await client.get(path, headers=headers)
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+        return requests / (time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Ejecutar el benchmark e imprimir la tabla de resultados."""
+    # Los logs por archivo y por petición distorsionarían la medida
+    logging.disable(logging.INFO)
+
+    file_manager.clear_files()
+    for i in range(args.files):
+        file_manager.add_file(f"documento_{i:06d}.pdf", f"file-{i:024x}")
+
+    baseline = create_baseline_app()
+    optimized = create_app()
+    identity = {"Accept-Encoding": "identity"}
+    gzip = {"Accept-Encoding": "gzip"}
+
+    print(f"📊 {args.requests} peticiones por endpoint, {args.files} archivos en /files/recent\n")
+    print(f"{'Endpoint':<28}{'Antes (req/s)':>15}{'Ahora (req/s)':>15}{'Mejora':>10}")
+    for path in ("/health", "/info", "/files/recent"):
+        before = await measure(baseline, path, args.requests, identity)
+        after = await measure(optimized, path, args.requests, identity)
+        print(f"{path:<28}{before:>15.0f}{after:>15.0f}{after / before:>9.2f}x")
+
+    gzip_rps = await measure(optimized, "/files/recent", args.requests, gzip)
+    transport = httpx.ASGITransport(app=optimized)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        raw = await client.get("/files/recent", headers=identity)
+        compressed = await client.get("/files/recent", headers=gzip)
+    compressed_size = int(compressed.headers.get("content-length", len(raw.content)))
+    print(f"{'/files/recent (gzip)':<28}{'':>15}{gzip_rps:>15.0f}")
+    print(
+        f"\n📦 /files/recent: {len(raw.content)} bytes sin comprimir, "
+        f"{compressed_size} bytes con gzip"
+    )
+
+
+def main() -> int:
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark de serialización de respuestas.")
+    parser.add_argument("--files", type=int, default=1000, help="Archivos en el listado")
+    parser.add_argument("--requests", type=int, default=2000, help="Peticiones por endpoint")
+    asyncio.run(run(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Evaluación offline de un corpus de documentos contra un CSV de criterios.
+
+Reutiliza directamente los servicios de la aplicación (sin pasar por HTTP):
+sube cada documento a OpenAI Files y evalúa cada criterio con la lógica de
+prompt.txt. Los resultados se escriben en JSONL a medida que llegan y el
+propio fichero de salida actúa como checkpoint: al relanzar el comando solo
+se procesan los pares (documento, criterio) que no terminaron correctamente.
+
+Uso:
+    python evaluate.py documentos/ criterios.csv -o resultados.jsonl -c 8
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import mimetypes
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services import openai_service, EvaluationService
+
+
+class RunStats:
+    """Contadores de la ejecución para el resumen final."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ok = 0
+        self.failed = 0
+        self.skipped = 0
+        self.uploaded = 0
+        self.latencies: List[float] = []
+
+    def summary(self) -> str:
+        """Construir el resumen de throughput."""
+        elapsed = time.perf_counter() - self.started
+        processed = self.ok + self.failed
+        lines = [
+            "📊 Resumen de la evaluación",
+            f"   Pares evaluados:   {processed} ({self.ok} ok, {self.failed} con error)",
+            f"   Pares ya hechos:   {self.skipped} (checkpoint)",
+            f"   Archivos subidos:  {self.uploaded}",
+            f"   Tiempo total:      {elapsed:.1f}s",
+            f"   Throughput:        {processed / elapsed if elapsed else 0:.2f} pares/s",
+        ]
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            lines.append(
+                f"   Latencia modelo:   media {statistics.mean(latencies):.2f}s, "
+                f"p50 {statistics.median(latencies):.2f}s, p95 {p95:.2f}s"
+            )
+        return "\n".join(lines)
+
+
+def load_criteria(csv_path: Path) -> List[Dict[str, str]]:
+    """Leer los criterios del CSV (columnas: tipo, nombre, descripcion, condicionantes)."""
+    with csv_path.open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = {"nombre", "descripcion"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Faltan columnas en el CSV de criterios: {', '.join(sorted(missing))}")
+        criteria = [
+            {key.strip(): (value or "").strip() for key, value in row.items() if key}
+            for row in reader
+        ]
+
+    names = [criterio["nombre"] for criterio in criteria]
+    duplicated = {name for name in names if names.count(name) > 1}
+    if duplicated:
+        raise ValueError(f"Nombres de criterio duplicados: {', '.join(sorted(duplicated))}")
+    return criteria
+
+
+def find_documents(docs_dir: Path, pattern: str) -> List[Tuple[Path, str]]:
+    """Listar los documentos con tipo MIME permitido, junto a su content type."""
+    documents = []
+    for path in sorted(docs_dir.rglob(pattern)):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        content_type, _ = mimetypes.guess_type(path.name)
+        if content_type not in settings.allowed_file_types:
+            print(f"⚠️  Ignorado (tipo no permitido): {path}")
+            continue
+        documents.append((path, content_type))
+    return documents
+
+
+def load_completed(output_path: Path) -> Set[Tuple[str, str]]:
+    """Obtener los pares (documento, criterio) ya evaluados correctamente."""
+    completed = set()
+    if not output_path.exists():
+        return completed
+    with output_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Última línea truncada por una interrupción
+                continue
+            if record.get("status") == "ok":
+                completed.add((record["document"], record["criterio"]))
+    return completed
+
+
+def load_uploads(uploads_path: Path) -> Dict[str, Dict[str, str]]:
+    """Leer el checkpoint de archivos ya subidos (documento -> sha256, file_id)."""
+    if not uploads_path.exists():
+        return {}
+    return json.loads(uploads_path.read_text(encoding="utf-8"))
+
+
+def save_uploads(uploads_path: Path, uploads: Dict[str, Dict[str, str]]) -> None:
+    """Guardar el checkpoint de subidas de forma atómica."""
+    tmp_path = uploads_path.with_suffix(uploads_path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(uploads, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, uploads_path)
+
+
+def _read_with_digest(path: Path) -> Tuple[bytes, str]:
+    """Leer un documento y calcular su sha256."""
+    content = path.read_bytes()
+    return content, hashlib.sha256(content).hexdigest()
+
+
+class CorpusEvaluator:
+    """Orquesta la subida de documentos y la evaluación concurrente de criterios."""
+
+    def __init__(
+        self,
+        evaluator: EvaluationService,
+        output_path: Path,
+        concurrency: int,
+        stats: RunStats,
+    ):
+        self.evaluator = evaluator
+        self.output_path = output_path
+        self.uploads_path = output_path.with_name(output_path.name + ".uploads.json")
+        self.uploads = load_uploads(self.uploads_path)
+        self.stats = stats
+        # Llamadas simultáneas a OpenAI (subidas y evaluaciones)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # Documentos en curso: acota la memoria y deja que las evaluaciones de
+        # un documento empiecen sin esperar a que se suba todo el corpus
+        self.document_slots = asyncio.Semaphore(concurrency)
+        self._output = None
+
+    async def run(
+        self,
+        documents: List[Tuple[Path, str]],
+        docs_dir: Path,
+        criteria: List[Dict[str, str]],
+        completed: Set[Tuple[str, str]],
+    ) -> None:
+        """Evaluar todos los pares pendientes."""
+        jobs = []
+        for path, content_type in documents:
+            document = path.relative_to(docs_dir).as_posix()
+            pending = [c for c in criteria if (document, c["nombre"]) not in completed]
+            self.stats.skipped += len(criteria) - len(pending)
+            if pending:
+                jobs.append(self._run_document(path, document, content_type, pending))
+
+        with self.output_path.open("a", encoding="utf-8") as self._output:
+            await asyncio.gather(*jobs)
+
+    async def _run_document(
+        self,
+        path: Path,
+        document: str,
+        content_type: str,
+        criteria: List[Dict[str, str]],
+    ) -> None:
+        """Subir un documento (si hace falta) y evaluar sus criterios pendientes."""
+        async with self.document_slots:
+            try:
+                file_id = await self._ensure_uploaded(path, document, content_type)
+            except Exception as e:
+                for criterio in criteria:
+                    self._write(document, criterio, None, status="error", error=f"Subida fallida: {e}")
+                return
+
+            await asyncio.gather(*(
+                self._evaluate_pair(document, file_id, criterio) for criterio in criteria
+            ))
+
+    async def _ensure_uploaded(self, path: Path, document: str, content_type: str) -> str:
+        """Reutilizar el file_id del checkpoint si el contenido no ha cambiado."""
+        content, digest = await asyncio.to_thread(_read_with_digest, path)
+        cached = self.uploads.get(document)
+        if cached and cached["sha256"] == digest:
+            return cached["file_id"]
+
+        async with self.semaphore:
+            file_id = await openai_service.upload_file(
+                file_content=content,
+                filename=path.name,
+                content_type=content_type,
+            )
+        self.uploads[document] = {"sha256": digest, "file_id": file_id}
+        save_uploads(self.uploads_path, self.uploads)
+        self.stats.uploaded += 1
+        return file_id
+
+    async def _evaluate_pair(self, document: str, file_id: str, criterio: Dict[str, str]) -> None:
+        """Evaluar un criterio sobre un documento y registrar el resultado."""
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            started = time.perf_counter()
+            try:
+                result = await loop.run_in_executor(
+                    None, self.evaluator.evaluate, file_id, criterio
+                )
+            except Exception as e:
+                error = getattr(e, "detail", None) or str(e)
+                self._write(document, criterio, file_id, status="error", error=error)
+                return
+            latency = time.perf_counter() - started
+
+        self.stats.latencies.append(latency)
+        self._write(document, criterio, file_id, status="ok", result=result, latency=latency)
+
+    def _write(
+        self,
+        document: str,
+        criterio: Dict[str, str],
+        file_id: Optional[str],
+        status: str,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+        latency: Optional[float] = None,
+    ) -> None:
+        """Añadir un registro al JSONL (todas las escrituras ocurren en el event loop)."""
+        if status == "ok":
+            self.stats.ok += 1
+        else:
+            self.stats.failed += 1
+            print(f"❌ {document} / {criterio['nombre']}: {error}")
+
+        record = {
+            "document": document,
+            "criterio": criterio["nombre"],
+            "file_id": file_id,
+            "status": status,
+            "model": settings.openai_model,
+            "latency_s": round(latency, 3) if latency is not None else None,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        if result is not None:
+            record["result"] = result
+        if error is not None:
+            record["error"] = error
+
+        self._output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._output.flush()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Definir y leer los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(
+        description="Evalúa un directorio de documentos contra un CSV de criterios."
+    )
+    parser.add_argument("docs_dir", type=Path, help="Directorio con los documentos")
+    parser.add_argument("criteria_csv", type=Path, help="CSV de criterios")
+    parser.add_argument(
+        "-o", "--output", type=Path, default=Path("resultados.jsonl"),
+        help="Fichero JSONL de resultados (también sirve de checkpoint)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=8,
+        help="Número máximo de llamadas simultáneas a OpenAI"
+    )
+    parser.add_argument(
+        "--pattern", default="*",
+        help="Patrón glob (recursivo) para seleccionar documentos"
+    )
+    parser.add_argument(
+        "--prompt", type=Path, default=None,
+        help="Prompt de evaluación (por defecto, el de la configuración)"
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency debe ser al menos 1")
+    if args.prompt is not None:
+        # Relativo al directorio actual, no a la raíz del proyecto
+        args.prompt = str(args.prompt.resolve())
+    return args
+
+
+async def run(args: argparse.Namespace, stats: RunStats) -> None:
+    """Preparar la ejecución y lanzar la evaluación."""
+    criteria = load_criteria(args.criteria_csv)
+
+    # Cargar el prompt antes de subir nada: una ruta errónea debe fallar al momento
+    evaluator = EvaluationService(openai_service, prompt_file=args.prompt)
+    try:
+        evaluator.prompt
+    except OSError as e:
+        raise ValueError(f"No se puede leer el prompt de evaluación: {e}")
+
+    documents = find_documents(args.docs_dir, args.pattern)
+    completed = load_completed(args.output)
+
+    total = len(documents) * len(criteria)
+    print(f"🔧 {len(documents)} documento(s) × {len(criteria)} criterio(s) = {total} pares")
+
+    # Hilos suficientes para que la concurrencia no quede limitada por el executor
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=args.concurrency))
+
+    runner = CorpusEvaluator(evaluator, args.output, args.concurrency, stats)
+    await runner.run(documents, args.docs_dir, criteria, completed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Función principal"""
+    args = parse_args(argv)
+    if not args.docs_dir.is_dir():
+        print(f"❌ No existe el directorio: {args.docs_dir}")
+        return 1
+    if not args.criteria_csv.is_file():
+        print(f"❌ No existe el CSV de criterios: {args.criteria_csv}")
+        return 1
+
+    stats = RunStats()
+    try:
+        asyncio.run(run(args, stats))
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrumpido: vuelve a ejecutar el comando para reanudar")
+        print(stats.summary())
+        return 130
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(stats.summary())
+    print(f"📄 Resultados en: {args.output}")
+    return 0 if stats.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
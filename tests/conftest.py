@@ -0,0 +1,7 @@
+"""
+Configuración común de los tests.
+"""
+import os
+
+# app.services crea el cliente de OpenAI al importarse: basta con una clave ficticia
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
@@ -0,0 +1,87 @@
+"""
+Tests del CLI de evaluación offline (checkpoint y reanudación).
+"""
+import asyncio
+import json
+
+import evaluate
+from evaluate import CorpusEvaluator, RunStats, load_completed
+
+CRITERIA = [{"nombre": "Envasos"}, {"nombre": "Residus"}]
+
+
+class FakeEvaluator:
+    """Evaluador que registra las llamadas y falla los criterios indicados."""
+
+    def __init__(self, calls, failing=()):
+        self.calls = calls
+        self.failing = set(failing)
+
+    def evaluate(self, file_id, criterio):
+        self.calls.append(("E", file_id, criterio["nombre"]))
+        if criterio["nombre"] in self.failing:
+            raise RuntimeError("fallo del modelo")
+        return {"nombre": criterio["nombre"], "cumple": True}
+
+
+def _run(tmp_path, monkeypatch, evaluator, concurrency=1):
+    calls = evaluator.calls
+
+    async def fake_upload(file_content, filename, content_type):
+        calls.append(("U", filename))
+        return f"file-{filename}"
+
+    monkeypatch.setattr(evaluate.openai_service, "upload_file", fake_upload)
+
+    docs_dir = tmp_path / "docs"
+    documents = [(path, "text/plain") for path in sorted(docs_dir.iterdir())]
+    output = tmp_path / "resultados.jsonl"
+    runner = CorpusEvaluator(evaluator, output, concurrency, RunStats())
+    asyncio.run(runner.run(documents, docs_dir, CRITERIA, load_completed(output)))
+    return output
+
+
+def _make_docs(tmp_path, count):
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    for i in range(count):
+        (docs_dir / f"doc{i}.txt").write_text(f"documento {i}", encoding="utf-8")
+
+
+def test_load_completed_skips_errors_and_truncated_lines(tmp_path):
+    output = tmp_path / "resultados.jsonl"
+    output.write_text(
+        json.dumps({"document": "a.txt", "criterio": "Envasos", "status": "ok"}) + "\n"
+        + json.dumps({"document": "a.txt", "criterio": "Residus", "status": "error"}) + "\n"
+        + '{"document": "b.txt", "crit',
+        encoding="utf-8"
+    )
+    assert load_completed(output) == {("a.txt", "Envasos")}
+
+
+def test_resume_only_retries_failed_pairs_and_reuses_uploads(tmp_path, monkeypatch):
+    _make_docs(tmp_path, 2)
+    first = FakeEvaluator([], failing={"Residus"})
+    output = _run(tmp_path, monkeypatch, first)
+    assert [call[0] for call in first.calls].count("U") == 2
+
+    second = FakeEvaluator([])
+    _run(tmp_path, monkeypatch, second)
+
+    # Sin nuevas subidas y solo los pares que fallaron
+    assert sorted(second.calls) == [
+        ("E", "file-doc0.txt", "Residus"),
+        ("E", "file-doc1.txt", "Residus"),
+    ]
+    assert load_completed(output) == {
+        (f"doc{i}.txt", nombre) for i in range(2) for nombre in ("Envasos", "Residus")
+    }
+
+
+def test_uploads_and_evaluations_interleave(tmp_path, monkeypatch):
+    _make_docs(tmp_path, 3)
+    evaluator = FakeEvaluator([])
+    _run(tmp_path, monkeypatch, evaluator)
+
+    # Con un único slot, cada documento se evalúa antes de subir el siguiente
+    assert [call[0] for call in evaluator.calls] == ["U", "E", "E"] * 3
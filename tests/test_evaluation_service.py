@@ -0,0 +1,81 @@
+"""
+Tests de la reutilización de veredictos entre revisiones.
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.evaluation_service import EvaluationService
+from app.services.revision_tracker import RevisionTracker
+
+CRITERIO = {
+    "tipo": "Obligatori",
+    "nombre": "Envasos",
+    "descripcion": "Els productes es subministraran en envasos reutilitzables",
+    "condicionantes": "",
+}
+
+
+class FakeAIService:
+    """Servicio de OpenAI falso que cuenta las llamadas."""
+
+    def __init__(self):
+        self.calls = []
+
+    def ask_about_files(self, question, file_ids, system_prompt=None):
+        self.calls.append(file_ids[0])
+        return json.dumps({"presence": {"evidence_criterio": ["envasos reutilitzables"]}})
+
+
+def _document(extra: str) -> str:
+    paragraphs = [f"Paragraf {i} " + "text " * 300 for i in range(5)]
+    paragraphs[1] = "Els productes es subministraran en envasos reutilitzables."
+    paragraphs[3] = extra
+    return "\n\n".join(paragraphs)
+
+
+def test_unchanged_criterio_is_carried_over_to_next_revision():
+    ai_service = FakeAIService()
+    tracker = RevisionTracker()
+    service = EvaluationService(ai_service, tracker=tracker)
+
+    tracker.register("plec.txt", "f1", _document("Import inicial."))
+    service.evaluate_file("f1", [CRITERIO])
+    tracker.register("plec.txt", "f2", _document("Import modificat."), previous_file_id="f1")
+    outcome = service.evaluate_file("f2")
+
+    assert ai_service.calls == ["f1"]
+    assert outcome["reused"] == 1
+    assert outcome["results"][0]["reused_from"] == "f1"
+
+
+def test_verdicts_survive_unevaluated_intermediate_revisions():
+    ai_service = FakeAIService()
+    tracker = RevisionTracker()
+    service = EvaluationService(ai_service, tracker=tracker)
+
+    tracker.register("plec.txt", "f1", _document("Import inicial."))
+    service.evaluate_file("f1", [CRITERIO])
+    tracker.register("plec.txt", "f2", _document("Import modificat."), previous_file_id="f1")
+    tracker.register("plec.txt", "f3", _document("Import final."), previous_file_id="f2")
+    tracker.register("plec.txt", "f4", _document("Import definitiu."), previous_file_id="f3")
+
+    revision = tracker.get_revision("f4")
+    assert revision.number == 4
+    assert revision.previous_file_id == "f3"
+    assert revision.base_file_id == "f1"
+    assert tracker.get_revision("f2") is None
+
+    outcome = service.evaluate_file("f4")
+    assert ai_service.calls == ["f1"]
+    assert outcome["results"][0]["reused_from"] == "f1"
+
+
+def test_evaluate_rejects_duplicate_criterio_names():
+    response = TestClient(app).post(
+        "/qa/evaluate",
+        json={"file_id": "f1", "criterios": [CRITERIO, dict(CRITERIO, descripcion="Una altra")]}
+    )
+    assert response.status_code == 422
+    assert "Envasos" in response.text
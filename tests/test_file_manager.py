@@ -0,0 +1,48 @@
+"""
+Tests del listado cacheado de archivos recientes.
+"""
+import orjson
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import file_manager
+from app.services.file_manager import FileManagerService
+
+
+def test_recent_files_json_is_invalidated_on_changes():
+    manager = FileManagerService()
+    assert orjson.loads(manager.get_recent_files_json()) == []
+
+    manager.add_file("a.pdf", "file-a")
+    manager.add_file("b.pdf", "file-b")
+    assert orjson.loads(manager.get_recent_files_json()) == [
+        {"filename": "a.pdf", "file_id": "file-a"},
+        {"filename": "b.pdf", "file_id": "file-b"},
+    ]
+
+    # Una nueva revisión cambia el file_id y pasa a ser la más reciente
+    manager.add_file("a.pdf", "file-a2")
+    assert orjson.loads(manager.get_recent_files_json()) == [
+        {"filename": "b.pdf", "file_id": "file-b"},
+        {"filename": "a.pdf", "file_id": "file-a2"},
+    ]
+
+    manager.clear_files()
+    assert orjson.loads(manager.get_recent_files_json()) == []
+
+
+def test_recent_files_json_matches_file_info_schema():
+    manager = FileManagerService()
+    manager.add_file("a.pdf", "file-a")
+    expected = [info.model_dump() for info in manager.get_recent_files()]
+    assert orjson.loads(manager.get_recent_files_json()) == expected
+
+
+def test_recent_files_endpoint_reflects_uploads():
+    client = TestClient(app)
+    file_manager.clear_files()
+    assert client.get("/files/recent").json() == []
+
+    file_manager.add_file("a.pdf", "file-a")
+    assert client.get("/files/recent").json() == [{"filename": "a.pdf", "file_id": "file-a"}]
+    file_manager.clear_files()
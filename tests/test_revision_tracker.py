@@ -0,0 +1,62 @@
+"""
+Tests del diff por chunks entre revisiones de documentos.
+"""
+from app.services.revision_tracker import DocumentRevision, RevisionTracker
+from app.services.text_extractor import extract_text
+
+
+CRITERIO = {
+    "tipo": "Obligatori",
+    "nombre": "Envasos",
+    "descripcion": "Els productes es subministraran en envasos reutilitzables",
+    "condicionantes": "",
+}
+
+
+def test_extract_text_returns_none_for_whitespace_only():
+    assert extract_text(b"\n\n  \n", "text/plain") is None
+
+
+def test_revision_without_chunks_has_no_hashes():
+    revision = DocumentRevision("scan.pdf", "f1", 1, "\n\n")
+    assert revision.chunks is None
+    assert revision.chunk_hashes is None
+
+
+def test_textless_revisions_are_not_diffed():
+    tracker = RevisionTracker()
+    tracker.register("scan.pdf", "f1", "\n\n")
+    revision = tracker.register("scan.pdf", "f2", "\n\n\n", previous_file_id="f1")
+
+    assert revision.number == 2
+    assert tracker.get_diff("f2") is None
+
+
+def test_unrelated_change_keeps_verdict():
+    paragraphs = [f"Paragraf {i} " + "text " * 300 for i in range(5)]
+    paragraphs[1] = "Els productes es subministraran en envasos reutilitzables."
+    edited = list(paragraphs)
+    edited[3] = "Paragraf 3 modificat amb un import diferent."
+
+    tracker = RevisionTracker()
+    tracker.register("plec.txt", "f1", "\n\n".join(paragraphs))
+    tracker.register("plec.txt", "f2", "\n\n".join(edited), previous_file_id="f1")
+    diff = tracker.get_diff("f2")
+
+    result = {"presence": {"evidence_criterio": ["envasos reutilitzables"]}}
+    assert diff.changed_chunks == 1
+    assert not diff.needs_reevaluation(CRITERIO, result)
+
+
+def test_changed_evidence_triggers_reevaluation():
+    paragraphs = [f"Paragraf {i} " + "text " * 300 for i in range(5)]
+    paragraphs[1] = "Els productes es subministraran en envasos reutilitzables."
+    edited = list(paragraphs)
+    edited[1] = "Els productes es subministraran en bosses de plastic."
+
+    tracker = RevisionTracker()
+    tracker.register("plec.txt", "f1", "\n\n".join(paragraphs))
+    tracker.register("plec.txt", "f2", "\n\n".join(edited), previous_file_id="f1")
+
+    result = {"presence": {"evidence_criterio": ["envasos reutilitzables"]}}
+    assert tracker.get_diff("f2").needs_reevaluation(CRITERIO, result)
@@ -0,0 +1,53 @@
+"""
+Tests de las sesiones de conversación.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import WebSocketDisconnect, status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import session_manager
+
+
+def _fake_conversation(question, file_ids, system_prompt, previous_response_id):
+    return f"respuesta a {question}", f"resp-{question}"
+
+
+def test_websocket_survives_malformed_messages(monkeypatch):
+    monkeypatch.setattr(session_manager.ai_service, "ask_in_conversation", _fake_conversation)
+    session = session_manager.create_session(["file-1"], "Eres un asistente")
+
+    with TestClient(app).websocket_connect(f"/qa/sessions/{session.session_id}/ws") as websocket:
+        websocket.send_text("esto no es JSON")
+        assert "error" in websocket.receive_json()
+
+        websocket.send_bytes(b'{"question": "hola"}')
+        assert "error" in websocket.receive_json()
+
+        websocket.send_json({"pregunta": "hola"})
+        assert "error" in websocket.receive_json()
+
+        websocket.send_json({"question": "hola"})
+        assert websocket.receive_json() == {"answer": "respuesta a hola", "turn": 1}
+
+    session_manager.delete_session(session.session_id)
+
+
+def test_concurrent_turns_get_their_own_number(monkeypatch):
+    monkeypatch.setattr(session_manager.ai_service, "ask_in_conversation", _fake_conversation)
+    session = session_manager.create_session(["file-1"], "Eres un asistente")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: session_manager.ask(session, f"p{i}"), range(20)))
+
+    assert sorted(turn for _, turn in results) == list(range(1, 21))
+    session_manager.delete_session(session.session_id)
+
+
+def test_websocket_rejects_unknown_session():
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with TestClient(app).websocket_connect("/qa/sessions/desconocida/ws"):
+            pass
+    assert exc_info.value.code == status.WS_1008_POLICY_VIOLATION
@@ -0,0 +1,106 @@
+"""
+Tests del índice de casi duplicados.
+"""
+import json
+
+from app.services.evaluation_service import EvaluationService
+from app.services.revision_tracker import RevisionTracker
+from app.services.similarity_index import NearDuplicateIndex, minhash_signature
+
+TEXT = (
+    "El adjudicatari subministrarà els productes en envasos reutilitzables i "
+    "retirarà els residus generats durant la prestació del servei cada setmana"
+)
+
+CRITERIO = {
+    "tipo": "Obligatori",
+    "nombre": "Envasos",
+    "descripcion": "Els productes es subministraran en envasos reutilitzables",
+    "condicionantes": "",
+}
+
+
+def test_textless_documents_have_no_signature():
+    assert minhash_signature("\n\n") is None
+    assert minhash_signature("  \n\n\n\n ") is None
+
+
+def test_textless_documents_are_not_near_duplicates():
+    tracker = RevisionTracker()
+    index = NearDuplicateIndex()
+    service = EvaluationService(ai_service=None, tracker=tracker, index=index)
+
+    # Un PDF escaneado con veredictos previos y otro nuevo sin texto
+    scanned = tracker.register("scan_a.pdf", "f1", None)
+    scanned.evaluations["Envasos"] = {"nombre": "Envasos", "cumple": True}
+    tracker.register("scan_b.pdf", "f2", None)
+    for file_id, text in (("f1", "\n\n"), ("f2", "\n\n\n\n")):
+        signature = minhash_signature(text)
+        if signature is not None:
+            index.add(file_id, file_id, signature)
+
+    assert len(index) == 0
+    assert service._near_duplicates("f2") == []
+
+
+def test_query_bounds_candidates_for_template_clusters():
+    index = NearDuplicateIndex(max_bucket_size=8, max_candidates=4)
+    signature = minhash_signature(TEXT)
+    for i in range(50):
+        index.add(f"copy-{i}", f"copia_{i}.pdf", signature)
+
+    assert all(len(bucket) <= 8 for buckets in index._buckets for bucket in buckets.values())
+    assert len(index) == 50
+    results = index.query(signature, top_k=10)
+    assert len(results) == 4
+    assert all(similarity == 1.0 for _, _, similarity in results)
+
+
+class FakeAIService:
+    """Servicio de OpenAI falso que cuenta las llamadas."""
+
+    def __init__(self):
+        self.calls = []
+
+    def ask_about_files(self, question, file_ids, system_prompt=None):
+        self.calls.append(file_ids[0])
+        return json.dumps({"presence": {"evidence_criterio": []}})
+
+
+def test_evaluated_copy_is_indexed_after_buckets_fill_up():
+    tracker = RevisionTracker()
+    index = NearDuplicateIndex(max_bucket_size=4, max_candidates=2)
+    ai_service = FakeAIService()
+    service = EvaluationService(ai_service, tracker=tracker, index=index)
+    signature = minhash_signature(TEXT)
+
+    def upload(file_id):
+        tracker.register(f"{file_id}.txt", file_id, TEXT)
+        index.add(file_id, f"{file_id}.txt", signature)
+
+    for i in range(10):
+        upload(f"copy-{i}")
+    upload("late")
+    service.evaluate_file("late", [CRITERIO])
+
+    upload("new")
+    outcome = service.evaluate_file("new", [CRITERIO])
+    assert ai_service.calls == ["late"]
+    assert outcome["results"][0]["reused_from"] == "late"
+
+
+def test_discarded_revisions_leave_the_index():
+    tracker = RevisionTracker()
+    index = NearDuplicateIndex()
+    tracker.add_discard_listener(index.remove)
+
+    previous_file_id = None
+    for i in range(1, 4):
+        file_id = f"f{i}"
+        tracker.register("plec.txt", file_id, f"{TEXT} revisio {i}", previous_file_id=previous_file_id)
+        index.add(file_id, "plec.txt", minhash_signature(f"{TEXT} revisio {i}"))
+        previous_file_id = file_id
+
+    assert tracker.get_revision("f1") is None
+    assert index.get_signature("f1") is None
+    assert [file_id for file_id, _, _ in index.query(index.get_signature("f3"), top_k=5, exclude="f3")] == ["f2"]